@@ -0,0 +1,146 @@
+"""
+Backend routing against local stand-in servers.
+
+Starts OpenAI-compatible stub servers in-process (each with its own latency and
+failure rate), routes chat completions through src.backends.BackendRegistry
+and reports how traffic and latency split across backends. The stubs answer
+with JSON filling whatever json_schema the request asks for.
+
+    python benchmarks/bench_backends.py --calls 400 --threads 16
+    python benchmarks/bench_backends.py --stubs "fast:0.02:0:4:3,slow:0.2:0:4:1,flaky:0.02:0.5:4:1"
+
+Each stub is name:latency_seconds:failure_rate:concurrency:weight. A stub can
+also be run on its own, e.g. to point the CLI at it via LLM_BACKENDS:
+
+    python benchmarks/bench_backends.py --serve 9001 --latency 0.1
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import BackendRegistry
+
+
+def _fill(schema):
+    """Minimal instance of a JSON schema (objects, arrays, scalars)."""
+    t = schema.get("type")
+    if isinstance(t, list):
+        t = next((x for x in t if x != "null"), "null")
+    if t == "object":
+        return {k: _fill(v) for k, v in schema.get("properties", {}).items()}
+    if t == "array":
+        return []
+    if t in ("integer", "number"):
+        return random.randint(0, 10)
+    if t == "boolean":
+        return False
+    if t == "string":
+        return "stub"
+    return None
+
+
+def make_handler(name: str, latency: float, failure_rate: float, failure_status: int = 503):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency * random.uniform(0.5, 1.5))
+            if random.random() < failure_rate:
+                self._send(failure_status, {"error": {"message": f"{name} unavailable", "type": "server_error"}})
+                return
+            schema = body.get("response_format", {}).get("json_schema", {}).get("schema", {"type": "object"})
+            content = json.dumps(_fill(schema))
+            self._send(200, {
+                "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": body.get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(content) // 4,
+                          "total_tokens": len(content) // 4},
+            })
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub(name: str, latency: float, failure_rate: float, port: int = 0,
+               failure_status: int = 503) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(name, latency, failure_rate, failure_status))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Route chat completions across local stub backends")
+    ap.add_argument("--stubs", default="fast:0.05:0:8:3,slow:0.3:0:8:1,flaky:0.05:0.3:8:1",
+                    help="Comma-separated name:latency:failure_rate:concurrency:weight")
+    ap.add_argument("--calls", type=int, default=300)
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--serve", type=int, default=None, help="Only run one stub server on this port")
+    ap.add_argument("--latency", type=float, default=0.1, help="Latency of the --serve stub")
+    ap.add_argument("--failure-rate", type=float, default=0.0, help="Failure rate of the --serve stub")
+    args = ap.parse_args()
+
+    if args.serve is not None:
+        print(f"Stub backend on http://127.0.0.1:{args.serve}/v1")
+        start_stub("stub", args.latency, args.failure_rate, args.serve).serve_forever()
+        return
+
+    config, servers = [], []
+    for spec in args.stubs.split(","):
+        name, latency, failure_rate, concurrency, weight = spec.split(":")
+        server = start_stub(name, float(latency), float(failure_rate))
+        servers.append(server)
+        config.append({"name": name, "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+                       "api_key": "stub", "concurrency": int(concurrency), "weight": float(weight)})
+    registry = BackendRegistry.from_config(config)
+
+    served = Counter()
+    failed = 0
+
+    def one(_):
+        resp = registry.chat(model="stub", messages=[{"role": "user", "content": "hi"}],
+                             response_format={"type": "json_schema", "json_schema": {
+                                 "name": "s", "schema": {"type": "object", "properties": {"score": {"type": "integer"}}}}})
+        return resp.model
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        futures = [pool.submit(one, i) for i in range(args.calls)]
+        for fut in futures:
+            try:
+                fut.result()
+                served["ok"] += 1
+            except Exception:
+                failed += 1
+    elapsed = time.perf_counter() - t0
+
+    print(f"calls: {args.calls}  ok: {served['ok']}  failed after failover: {failed}  wall: {elapsed:.2f}s")
+    print(f"{'backend':<10} {'weight':>6} {'calls':>6} {'errors':>6} {'p50 s':>7} {'p95 s':>7}")
+    for b in registry.backends:
+        s = b.stats()
+        print(f"{b.name:<10} {b.weight:>6g} {s['calls']:>6} {s['errors']:>6} "
+              f"{s['p50_seconds'] or 0:>7.3f} {s['p95_seconds'] or 0:>7.3f}")
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Out-of-core hashing prefilter vs the exact TF-IDF prefilter.
+
+Streams resumes into a ResumeStore, then shortlists with prefilter_store
+(TfidfVectorizer over the whole pool) and prefilter_store_out_of_core
+(hashed features, streamed IDF, top-k heap). Reports recall@k of the
+out-of-core shortlist against the exact one, wall time, and peak memory
+allocated during each prefilter (tracemalloc, so the store's text on disk
+and the parse itself are not counted; timing is from a separate untraced run).
+No network calls are made.
+
+    python benchmarks/bench_oocore_prefilter.py --sizes 2000,10000,40000 --k 100
+    python benchmarks/bench_oocore_prefilter.py --resumes ./resumes --jd ./jd.txt --k 100
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import iter_resumes
+from src.resume_store import ResumeStore
+from src.prefilter import prefilter_store, prefilter_store_out_of_core, PREFILTER_BATCH_SIZE, PREFILTER_HASH_FEATURES
+
+SYNTHETIC_JD = ("Senior Python developer. Django or FastAPI, PostgreSQL, Docker, Kubernetes, AWS. "
+                "Experience with pandas, NLP and LLM tooling (LangChain) is a plus. Kafka, Airflow, CI/CD, Terraform.")
+_SKILLS = ("python django flask fastapi sql postgresql docker kubernetes aws gcp pandas numpy pytorch "
+           "tensorflow nlp llm langchain react javascript typescript java spring golang kafka spark "
+           "airflow redis mongodb graphql terraform linux git microservices").split()
+_OTHER = ("sales marketing accounting audit excel cooking nursing teaching logistics retail customer "
+          "negotiation recruiting payroll design photoshop illustrator writing editing").split()
+_FILLER = ("worked team project delivered improved managed built led responsible developed years "
+           "experience company role collaborated stakeholders results").split()
+
+
+def _synthetic_texts(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(n):
+        tech = rng.random()
+        words = []
+        for _ in range(rng.randint(150, 600)):
+            r = rng.random()
+            pool = _SKILLS if r < tech * 0.3 else _OTHER if r < 0.45 else _FILLER
+            words.append(rng.choice(pool))
+        # A few unique tokens per resume so the vocabulary grows with the pool, as with real names/employers
+        yield f"Candidate{i} employer{i} school{i * 7}\n" + " ".join(words)
+
+
+def _measure(fn):
+    # Timed and memory-traced separately: tracemalloc slows tokenization considerably
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 2 ** 20
+
+
+def run(store, jd_text, k, batch_size, n_features):
+    (exact_idx, _), exact_s, exact_mb = _measure(lambda: prefilter_store(store, jd_text, top_k=k))
+    (ooc_idx, _), ooc_s, ooc_mb = _measure(
+        lambda: prefilter_store_out_of_core(store, jd_text, top_k=k, batch_size=batch_size, n_features=n_features))
+    recall = len(set(exact_idx.tolist()) & set(ooc_idx.tolist())) / max(1, len(exact_idx))
+    print(f"{len(store):>8} {recall:>9.3f} {exact_s:>9.2f} {ooc_s:>9.2f} {exact_mb:>10.1f} {ooc_mb:>10.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Out-of-core hashing prefilter: recall@k, time and peak memory")
+    ap.add_argument("--resumes", default=None, help="Folder of resumes (default: synthetic)")
+    ap.add_argument("--jd", default=None, help="Job description .txt (required with --resumes)")
+    ap.add_argument("--sizes", default="2000,10000,40000", help="Synthetic pool sizes")
+    ap.add_argument("--k", type=int, default=100)
+    ap.add_argument("--batch-size", type=int, default=PREFILTER_BATCH_SIZE)
+    ap.add_argument("--n-features", type=int, default=PREFILTER_HASH_FEATURES)
+    args = ap.parse_args()
+
+    if args.resumes and not args.jd:
+        ap.error("--jd is required with --resumes")
+    jd_text = open(args.jd, encoding="utf-8").read() if args.jd else SYNTHETIC_JD
+
+    print(f"{'resumes':>8} {'recall@' + str(args.k):>9} {'exact s':>9} {'ooc s':>9} {'exact MiB':>10} {'ooc MiB':>10}")
+    if args.resumes:
+        with ResumeStore() as store:
+            store.add_all(iter_resumes(args.resumes))
+            run(store, jd_text, args.k, args.batch_size, args.n_features)
+        return
+    for n in (int(x) for x in args.sizes.split(",")):
+        with ResumeStore() as store:
+            for i, text in enumerate(_synthetic_texts(n)):
+                store.add(f"resume_{i}.txt", None, text)
+            run(store, jd_text, args.k, args.batch_size, args.n_features)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# src/backends.py
+"""
+Registry of OpenAI-compatible LLM backends.
+
+Configure with LLM_BACKENDS: a JSON list (or a path to a JSON file) of
+    {"name": "lan", "base_url": "http://10.0.0.5:8000/v1", "model": "qwen2.5-14b-instruct",
+     "concurrency": 8, "weight": 3, "api_key_env": "LAN_LLM_KEY"}
+All fields are optional: base_url defaults to the OpenAI API (or OPENAI_BASE_URL),
+model to the model requested by the caller, api_key to OPENAI_API_KEY.
+Without LLM_BACKENDS there is a single default backend, as before.
+
+Requests are routed by weight among backends with a free concurrency slot; a
+backend failing with a connection error, timeout, 429 or 5xx is skipped for the
+rest of that request (failover) and cooled down after repeated failures.
+"""
+import os
+import json
+import time
+import random
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import openai
+from openai import OpenAI
+
+from src.utils import LATENCY_WINDOW, percentile
+
+LLM_BACKENDS = os.getenv("LLM_BACKENDS", "")
+BACKEND_FAILURES_BEFORE_COOLDOWN = int(os.getenv("BACKEND_FAILURES_BEFORE_COOLDOWN", "3"))
+BACKEND_COOLDOWN_SECONDS = float(os.getenv("BACKEND_COOLDOWN_SECONDS", "30"))
+
+
+class Backend:
+    def __init__(self, name: str, base_url: Optional[str] = None, model: Optional[str] = None,
+                 api_key: Optional[str] = None, concurrency: int = 16, weight: float = 1.0,
+                 max_retries: int = 2):
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self.concurrency = max(1, int(concurrency))
+        self.weight = max(0.0, float(weight))
+        # Local servers usually ignore the key, but the client requires one
+        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY") or "EMPTY", base_url=base_url,
+                             max_retries=max_retries)
+        # For calls under a deadline: a retry would outlive it
+        self.single_attempt_client = self.client.with_options(max_retries=0)
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def available(self) -> bool:
+        return self.weight > 0 and time.monotonic() >= self.cooldown_until
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self._latencies.append(seconds)
+                self.consecutive_failures = 0
+            else:
+                self.errors += 1
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= BACKEND_FAILURES_BEFORE_COOLDOWN:
+                    self.cooldown_until = time.monotonic() + BACKEND_COOLDOWN_SECONDS
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = list(self._latencies)
+            out = {"calls": self.calls, "errors": self.errors,
+                   "cooling_down": time.monotonic() < self.cooldown_until}
+        for p in (50, 95):
+            out[f"p{p}_seconds"] = round(percentile(lat, p), 3) if lat else None
+        return out
+
+
+def _is_retryable(e: Exception) -> bool:
+    """Errors worth trying on another backend; bad requests are not."""
+    if isinstance(e, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    return isinstance(e, openai.APIStatusError) and e.status_code >= 500
+
+
+class BackendRegistry:
+    def __init__(self, backends: List[Backend]):
+        if not backends:
+            raise ValueError("At least one LLM backend is required")
+        self.backends = backends
+
+    @classmethod
+    def from_config(cls, config: List[Dict[str, Any]]) -> "BackendRegistry":
+        backends = []
+        # With somewhere else to go, fail over instead of retrying the same backend
+        retries = 2 if len(config) == 1 else 0
+        for i, c in enumerate(config):
+            api_key = c.get("api_key") or (os.getenv(c["api_key_env"]) if c.get("api_key_env") else None)
+            backends.append(Backend(
+                name=c.get("name") or f"backend{i}",
+                base_url=c.get("base_url"),
+                model=c.get("model"),
+                api_key=api_key,
+                concurrency=c.get("concurrency", 16),
+                weight=c.get("weight", 1.0),
+                max_retries=c.get("max_retries", retries),
+            ))
+        return cls(backends)
+
+    @classmethod
+    def from_env(cls, spec: str = LLM_BACKENDS) -> "BackendRegistry":
+        """LLM_BACKENDS as inline JSON or a JSON file path; unset -> one default backend."""
+        spec = spec.strip()
+        if not spec:
+            return cls([Backend("default")])
+        if not spec.startswith("["):
+            with open(spec, "r", encoding="utf-8") as f:
+                spec = f.read()
+        return cls.from_config(json.loads(spec))
+
+    def _route(self, exclude) -> List[Backend]:
+        """Candidates in weighted-random order (available ones first)."""
+        pool = [b for b in self.backends if b not in exclude and b.weight > 0]
+        # Efraimidis-Spirakis: sort by u^(1/w) descending = weighted sampling without replacement
+        keyed = sorted(pool, key=lambda b: random.random() ** (1.0 / b.weight), reverse=True)
+        return [b for b in keyed if b.available()] + [b for b in keyed if not b.available()]
+
+    def _acquire(self, candidates: List[Backend]) -> Backend:
+        for b in candidates:
+            if b.slots.acquire(blocking=False):
+                return b
+        # Everything is busy: wait for the preferred backend
+        candidates[0].slots.acquire()
+        return candidates[0]
+
+    def chat(self, retries: bool = True, **kwargs) -> Any:
+        """
+        chat.completions.create on the routed backend, failing over to the others.
+        With retries=False each backend gets one attempt (no client-side retries).
+        """
+        tried, last_error = set(), None
+        while True:
+            candidates = self._route(tried)
+            if not candidates:
+                raise last_error or RuntimeError("No LLM backend available")
+            backend = self._acquire(candidates)
+            tried.add(backend)
+            request = dict(kwargs)
+            if backend.model:
+                request["model"] = backend.model
+            t0 = time.perf_counter()
+            try:
+                client = backend.client if retries else backend.single_attempt_client
+                resp = client.chat.completions.create(**request)
+            except Exception as e:
+                backend.record(time.perf_counter() - t0, ok=False)
+                if not _is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            finally:
+                backend.slots.release()
+            backend.record(time.perf_counter() - t0, ok=True)
+            return resp
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {b.name: b.stats() for b in self.backends}
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{name}: {s['calls']} calls, {s['errors']} errors"
+            + (f", p50 {s['p50_seconds']}s" if s["p50_seconds"] is not None else "")
+            for name, s in self.stats().items()
+        )
+
+
+_registry: Optional[BackendRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> BackendRegistry:
+    """Process-wide registry, built on first use (so keys set at runtime, e.g. by the UI, are picked up)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BackendRegistry.from_env(os.getenv("LLM_BACKENDS", LLM_BACKENDS))
+        return _registry
+
+
+def set_registry(registry: Optional[BackendRegistry]) -> None:
+    """Replace (or with None, reset) the process-wide registry."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
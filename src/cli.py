@@ -1,51 +1,256 @@
-import argparse, os, json
+import argparse, os, sys, json
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from src.parser import parse_resumes
-from src.prefilter import prefilter_resumes
-from src.scorer import score_with_llm
+from src.parser import parse_resumes, iter_resumes, list_resume_files, PARSE_MAX_CHARS, PARSE_MAX_PAGES
+from src.parse_pool import ParsePool, parse_resumes_isolated, iter_resumes_isolated, slowest, PARSE_ISOLATED, PARSE_TIMEOUT
+from src.prefilter import prefilter_resumes, prefilter_store, prefilter_store_out_of_core, top_k_indices
+from src.resume_store import ResumeStore
+from src.pipeline import run_pipeline, PIPELINE_SCORE_WORKERS
+from src.rubric_parser import parse_rubric
+from src.scorer import ScoringSession, explain_top, SCORE_EXPLAIN_TOP
+from src.hedging import HedgedCaller, LLM_CALL_TIMEOUT, LLM_HEDGE
+from src.backends import get_registry
 from src.ranker import aggregate_and_rank
+from src.columnar import write_parquet
+from src.watch import watch_folder, WATCH_INTERVAL
+from src.shard import (
+    parse_shard_spec, shard_filter, write_shortlist, read_shortlist,
+    merge_shortlists, merge_rankings,
+)
+
+def merge_main(argv):
+    ap = argparse.ArgumentParser(prog="python -m src.cli merge", description="Merge sharded runs into one global output")
+    ap.add_argument("--shards", nargs="+", required=True, help="Output folders of the shard runs")
+    ap.add_argument("--out", default="./out", help="Output folder for the merged result")
+    ap.add_argument("--shortlists", action="store_true", help="Merge per-shard prefilter shortlists instead of rankings")
+    ap.add_argument("--k", type=int, default=100, help="Global shortlist size (with --shortlists)")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    if args.shortlists:
+        path = merge_shortlists(args.shards, args.out, args.k)
+        print(f"Done.\n- Saved global shortlist: {path}")
+    else:
+        count = merge_rankings(args.shards, args.out)
+        print(f"Done.\n- Merged {len(args.shards)} shards, {count} ranked resumes into {args.out}")
+
+def _parse_and_shortlist_compact(args, include, global_shortlist, jd_text):
+    """
+    --compact: parsed text is streamed into a ResumeStore (one memory-mapped temp file),
+    prefilter scores stay in a numpy array, and only shortlisted texts become strings.
+    With --out-of-core the prefilter itself runs in fixed memory (hashed features, top-k heap).
+    """
+    with ResumeStore() as store:
+        if args.parse_inline:
+            store.add_all(iter_resumes(args.resumes, include=include, max_chars=args.max_chars, max_pages=args.max_pages))
+        else:
+            with ParsePool(timeout=args.parse_timeout, max_chars=args.max_chars, max_pages=args.max_pages) as pool:
+                store.add_all(iter_resumes_isolated(args.resumes, include=include, pool=pool))
+            print("Slowest files to parse: " + ", ".join(f"{name} ({secs:.2f}s)" for name, secs in store.slowest()))
+
+        if global_shortlist is not None:
+            scores = np.array([global_shortlist[r.filename] for r in store.records], dtype=float)
+            idx = top_k_indices(scores, len(scores))
+        elif args.out_of_core:
+            idx, top_scores = prefilter_store_out_of_core(store, jd_text, top_k=args.k)
+            return [store.materialize(int(i), prefilter_score=float(s)) for i, s in zip(idx, top_scores)]
+        else:
+            idx, scores = prefilter_store(store, jd_text, top_k=args.k)
+        return [store.materialize(int(i), prefilter_score=float(scores[i])) for i in idx]
+
+def _run_pipelined(args, include, jd_text):
+    """--pipeline: stream parsed resumes into run_pipeline; returns (shortlisted, results, session, stats)."""
+    session = ScoringSession(jd_text, parse_rubric(), caller=HedgedCaller(timeout=args.call_timeout, hedge=args.hedge))
+    total = len(list_resume_files(args.resumes, include))
+    bars = {"parse": tqdm(total=total, desc="Parsing (scoring in background)"), "score": None}
+
+    def on_progress(stage, done, stage_total):
+        if stage == "score" and bars["score"] is None:
+            bars["parse"].close()
+            bars["score"] = tqdm(total=stage_total, desc="LLM scoring")
+        bar = bars[stage]
+        bar.update(done - bar.n)
+
+    timings = []
+
+    def run(resumes):
+        def timed():
+            for r in resumes:
+                timings.append({"filename": r["filename"], "parse_seconds": r.get("parse_seconds", 0.0)})
+                yield r
+        return run_pipeline(timed(), total, jd_text, session, args.k, explain=not args.two_pass,
+                            workers=args.score_workers, on_progress=on_progress)
+
+    if args.parse_inline:
+        shortlisted, results, stats = run(iter_resumes(args.resumes, include=include,
+                                                       max_chars=args.max_chars, max_pages=args.max_pages))
+    else:
+        with ParsePool(timeout=args.parse_timeout, max_chars=args.max_chars, max_pages=args.max_pages) as pool:
+            shortlisted, results, stats = run(iter_resumes_isolated(args.resumes, include=include, pool=pool))
+    for bar in bars.values():
+        if bar is not None:
+            bar.close()
+    if not args.parse_inline:
+        print("Slowest files to parse: " + ", ".join(f"{name} ({secs:.2f}s)" for name, secs in slowest(timings)))
+    return shortlisted, results, session, stats
 
 def main():
+    if sys.argv[1:2] == ["merge"]:
+        return merge_main(sys.argv[2:])
+
     ap = argparse.ArgumentParser(description="Resume Screener (incremental)")
     ap.add_argument("--resumes", required=True, help="Folder with resumes")
     ap.add_argument("--jd", required=True, help="Path to job description .txt")
     ap.add_argument("--out", default="./out", help="Output folder")
     ap.add_argument("--k", type=int, default=100, help="Shortlist size for LLM")
+    ap.add_argument("--parquet", action="store_true", help="Also write typed results.parquet (requires pyarrow)")
+    ap.add_argument("--watch", action="store_true", help="Keep running: score new/changed files and update outputs live")
+    ap.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Watch mode polling interval in seconds")
+    ap.add_argument("--parse-inline", action="store_true", default=not PARSE_ISOLATED,
+                    help="Parse in this process instead of isolated, time-limited workers")
+    ap.add_argument("--parse-timeout", type=float, default=PARSE_TIMEOUT, help="Per-file parse time limit in seconds")
+    ap.add_argument("--two-pass", action="store_true",
+                    help="Score with numbers only first, then generate reasons/evidence for the top --explain-top")
+    ap.add_argument("--explain-top", type=int, default=SCORE_EXPLAIN_TOP,
+                    help="With --two-pass: how many top-ranked resumes get reasons and evidence")
+    ap.add_argument("--call-timeout", type=float, default=LLM_CALL_TIMEOUT, help="Deadline per LLM scoring call in seconds")
+    ap.add_argument("--hedge", action="store_true", default=LLM_HEDGE,
+                    help="Re-issue LLM calls slower than the observed p95 latency (capped by LLM_HEDGE_MAX_RATE)")
+    ap.add_argument("--compact", action="store_true",
+                    help="Keep parsed text in a memory-mapped temp file; only shortlisted texts are loaded")
+    ap.add_argument("--out-of-core", action="store_true",
+                    help="Fixed-memory hashing prefilter over the compact store (implies --compact)")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Start LLM scoring of likely finalists while parsing continues; the shortlist is still the exact top-k")
+    ap.add_argument("--score-workers", type=int, default=PIPELINE_SCORE_WORKERS,
+                    help="With --pipeline: concurrent LLM scoring calls")
+    ap.add_argument("--max-chars", type=int, default=PARSE_MAX_CHARS,
+                    help="Stop extracting a file after this many characters (0 = no limit)")
+    ap.add_argument("--max-pages", type=int, default=PARSE_MAX_PAGES,
+                    help="Stop extracting a PDF after this many pages (0 = no limit)")
+    ap.add_argument("--shard", default=None, help="Only process shard i of N (e.g. 0/4), partitioned by stable hash")
+    ap.add_argument("--shard-by", choices=["name", "content"], default="name", help="Hash file name or file content for --shard")
+    ap.add_argument("--prefilter-only", action="store_true", help="Write shortlist.jsonl (top-k prefilter scores) and stop")
+    ap.add_argument("--shortlist", default=None, help="Score only files listed in this (merged) shortlist.jsonl")
     args = ap.parse_args()
+    if args.watch:
+        # Watch mode keeps one live, fully explained ranking of the whole folder
+        unsupported = [flag for flag, on in (
+            ("--two-pass", args.two_pass), ("--parquet", args.parquet), ("--compact", args.compact),
+            ("--out-of-core", args.out_of_core), ("--shard", args.shard), ("--shortlist", args.shortlist),
+            ("--prefilter-only", args.prefilter_only), ("--pipeline", args.pipeline),
+        ) if on]
+        if unsupported:
+            ap.error(f"--watch cannot be combined with {', '.join(unsupported)}")
+    args.compact = args.compact or args.out_of_core
+    if args.pipeline and (args.compact or args.shortlist or args.prefilter_only):
+        ap.error("--pipeline cannot be combined with --compact, --out-of-core, --shortlist or --prefilter-only")
 
     os.makedirs(args.out, exist_ok=True)
 
-    # 1) Parse resumes
-    resumes = parse_resumes(args.resumes)
+    if args.watch:
+        with open(args.jd, "r", encoding="utf-8") as f:
+            jd_text = f.read()
+        session = ScoringSession(jd_text, parse_rubric(),
+                                 caller=HedgedCaller(timeout=args.call_timeout, hedge=args.hedge))
+        if args.parse_inline:
+            watch_folder(args.resumes, session, args.out, top_k=args.k, interval=args.interval,
+                         max_chars=args.max_chars, max_pages=args.max_pages)
+        else:
+            with ParsePool(timeout=args.parse_timeout, max_chars=args.max_chars, max_pages=args.max_pages) as pool:
+                watch_folder(args.resumes, session, args.out, top_k=args.k, interval=args.interval, pool=pool)
+        return
+
+    shard, num_shards = parse_shard_spec(args.shard) if args.shard else (0, 1)
+    include = shard_filter(shard, num_shards, args.shard_by) if num_shards > 1 else None
+    global_shortlist = read_shortlist(args.shortlist) if args.shortlist else None
+    if global_shortlist is not None:
+        # Only parse what made the global shortlist; its prefilter scores are reused
+        in_shard = include
+
+        def include(path):
+            return os.path.basename(path) in global_shortlist and (in_shard is None or in_shard(path))
 
     # 2) Load JD
     with open(args.jd, "r", encoding="utf-8") as f:
         jd_text = f.read()
 
-    # 3) Prefilter on ALL parsed resumes, then shortlist
-    shortlisted = prefilter_resumes(resumes, jd_text, top_k=args.k)
+    # 1+3+4) Pipelined: parse, prefilter and score overlap (see src/pipeline.py)
+    if args.pipeline:
+        shortlisted, results, session, pipeline_stats = _run_pipelined(args, include, jd_text)
+    # 1+3) Parse resumes, prefilter on ALL of them, then shortlist
+    elif args.compact:
+        shortlisted = _parse_and_shortlist_compact(args, include, global_shortlist, jd_text)
+    else:
+        if args.parse_inline:
+            resumes = parse_resumes(args.resumes, include=include, max_chars=args.max_chars, max_pages=args.max_pages)
+        else:
+            with ParsePool(timeout=args.parse_timeout, max_chars=args.max_chars, max_pages=args.max_pages) as pool:
+                resumes = parse_resumes_isolated(args.resumes, include=include, pool=pool)
+            print("Slowest files to parse: " + ", ".join(f"{name} ({secs:.2f}s)" for name, secs in slowest(resumes)))
+
+        if global_shortlist is not None:
+            for r in resumes:
+                r["prefilter_score"] = global_shortlist[r["filename"]]
+            shortlisted = sorted(resumes, key=lambda x: x["prefilter_score"], reverse=True)
+        else:
+            shortlisted = prefilter_resumes(resumes, jd_text, top_k=args.k)
+
+    if args.prefilter_only:
+        path = write_shortlist(args.out, shortlisted, shard)
+        print(f"Done.\n- Saved shortlist: {path}\n- Shortlisted resumes: {len(shortlisted)}")
+        return
 
-    # 4) LLM scoring
-    results = []
-    for res in tqdm(shortlisted, desc="LLM scoring"):
-        scored = score_with_llm(res, jd_text)
-        results.append(scored)
+    # 4) LLM scoring (rubric parsed and prompt compiled once for the whole run)
+    if not args.pipeline:
+        pipeline_stats = None
+        rubric = parse_rubric()
+        session = ScoringSession(jd_text, rubric, caller=HedgedCaller(timeout=args.call_timeout, hedge=args.hedge))
+        results = []
+        for res in tqdm(shortlisted, desc="LLM scoring"):
+            scored = session.score(res, explain=not args.two_pass)
+            results.append(scored)
 
-    # 5) Write JSONL
+    # 5) Final aggregation + ranking
+    ranked = aggregate_and_rank(results)
+
+    # 5b) Two-pass: reasons/evidence only for the finalists (scores, and so the ranking, are unchanged)
+    two_pass_stats = None
+    if args.two_pass:
+        with tqdm(total=min(args.explain_top, len(ranked)), desc="Explaining top results") as bar:
+            two_pass_stats = explain_top(session, ranked, shortlisted, args.explain_top,
+                                         on_progress=lambda done, total: bar.update(1))
+
+    # 6) Write JSONL (ranked order, so shard outputs can be k-way merged) + CSV
     jsonl_path = os.path.join(args.out, "details.jsonl")
     with open(jsonl_path, "w", encoding="utf-8") as f:
-        for r in results:
+        for r in ranked:
             f.write(json.dumps(r, ensure_ascii=False) + "\n")
 
-    # 6) Final aggregation + ranking
-    ranked = aggregate_and_rank(results)
     df = pd.DataFrame(ranked)
     csv_path = os.path.join(args.out, "results.csv")
     df.to_csv(csv_path, index=False)
 
     print(f"Done.\n- Saved details: {jsonl_path}\n- Saved ranked CSV: {csv_path}\n- Scored resumes: {len(results)}")
+    tokens = sum(r.get("completion_tokens", 0) for r in results)
+    print(f"- Completion tokens: {tokens} ({tokens / max(1, len(results)):.0f} per resume)")
+    print(f"- LLM calls: {session.caller.summary()}")
+    print(f"- Backends: {get_registry().summary()}")
+    if pipeline_stats:
+        print(f"- Pipeline: {pipeline_stats['admitted_early']} admitted while parsing "
+              f"({pipeline_stats['early_in_top_k']} made the top {args.k}), {pipeline_stats['scored_late']} scored after parsing, "
+              f"{pipeline_stats['wasted_calls']} extra LLM calls")
+    if two_pass_stats:
+        print(f"- Two-pass: scores {two_pass_stats['pass1_tokens']} + explanations {two_pass_stats['pass2_tokens']} tokens; "
+              f"{two_pass_stats['skipped']} resumes not explained, ~{two_pass_stats['est_saved_tokens']} completion tokens saved")
+
+    # 7) Optional typed columnar output (nested fields kept as list/struct columns)
+    if args.parquet:
+        parquet_path = os.path.join(args.out, "results.parquet")
+        write_parquet(parquet_path, ranked, session.dims)
+        print(f"- Saved Parquet: {parquet_path}")
 
 if __name__ == "__main__":
     main()
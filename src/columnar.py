@@ -0,0 +1,125 @@
+# src/columnar.py
+import os
+from typing import Dict, Any, List, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: pip install pyarrow
+    pa = None
+    pq = None
+
+from src.scorer import _dynamic_schema
+
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "1000"))
+
+# Columns added after scoring (prefilter + ranking), not part of the LLM schema
+_EXTRA_FIELDS = {
+    "scoring_status": {"type": "string"},
+    "scoring_issues": {"type": "array", "items": {"type": "string"}},
+    "prefilter_score": {"type": "number"},
+    "final_score": {"type": "number"},
+    "rank": {"type": "integer"},
+    "completion_tokens": {"type": "integer"},
+    "explained": {"type": "boolean"},
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet output requires pyarrow: pip install pyarrow")
+
+
+def _arrow_type(spec: Dict[str, Any]):
+    """Map a JSON-schema property (as produced by src.scorer) to an Arrow type."""
+    t = spec.get("type")
+    if isinstance(t, list):
+        t = next((x for x in t if x != "null"), "string")
+    if t == "integer":
+        return pa.int64()
+    if t == "number":
+        return pa.float64()
+    if t == "boolean":
+        return pa.bool_()
+    if t == "array":
+        return pa.list_(_arrow_type(spec.get("items", {})))
+    if t == "object":
+        return pa.struct([pa.field(k, _arrow_type(v)) for k, v in spec.get("properties", {}).items()])
+    return pa.string()
+
+
+def results_schema(dimensions: List[Dict[str, Any]]):
+    """Typed Arrow schema for scored results, including <letter>_<key>_score columns."""
+    _require_pyarrow()
+    props = dict(_dynamic_schema(dimensions)["properties"])
+    props.update(_EXTRA_FIELDS)
+    return pa.schema([pa.field(name, _arrow_type(spec)) for name, spec in props.items()])
+
+
+def _coerce(value: Any, typ) -> Any:
+    """Best-effort conversion of LLM output to the column type; bad values become null."""
+    if value is None:
+        return None
+    try:
+        if pa.types.is_integer(typ):
+            return int(float(value))
+        if pa.types.is_floating(typ):
+            return float(value)
+        if pa.types.is_boolean(typ):
+            return bool(value)
+        if pa.types.is_list(typ):
+            if not isinstance(value, list):
+                return None
+            return [_coerce(v, typ.value_type) for v in value]
+        if pa.types.is_struct(typ):
+            if not isinstance(value, dict):
+                return None
+            return {f.name: _coerce(value.get(f.name), f.type) for f in typ}
+        return value if isinstance(value, str) else str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParquetResultsWriter:
+    """
+    Stream result rows to a Parquet file one row group at a time, so only
+    `row_group_size` rows are ever held as Arrow data.
+    """
+
+    def __init__(self, path: str, dimensions: List[Dict[str, Any]], row_group_size: int = PARQUET_ROW_GROUP_SIZE):
+        self.schema = results_schema(dimensions)
+        self.row_group_size = max(1, row_group_size)
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self._buffer = []
+        self.rows_written = 0
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._buffer.append({f.name: _coerce(row.get(f.name), f.type) for f in self.schema})
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self.schema))
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_parquet(path: str, rows: Iterable[Dict[str, Any]], dimensions: List[Dict[str, Any]],
+                  row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> int:
+    """Write rows to `path` in streaming row groups; returns number of rows written."""
+    with ParquetResultsWriter(path, dimensions, row_group_size) as w:
+        for r in rows:
+            w.write(r)
+    return w.rows_written
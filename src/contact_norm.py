@@ -27,7 +27,9 @@ def _dedupe_keep_order(items: List[str]) -> List[str]:
 
 def _canon_linkedin(s: str) -> str:
     s = s.strip().lstrip("/")
-    if not s.lower().startswith("http"):
+    if s.lower().startswith("linkedin.com/"):
+        s = "https://www." + s
+    elif not s.lower().startswith("http"):
         s = "https://www.linkedin.com/" + s
     # normalize double slashes, trailing punctuation
     return s.rstrip(").,;")
@@ -0,0 +1,176 @@
+# src/hedging.py
+"""
+Per-call deadlines and hedged requests for LLM calls.
+
+Every call gets a wall-clock deadline (LLM_CALL_TIMEOUT). With hedging on, a
+call that has not returned after the observed LLM_HEDGE_PERCENTILE latency
+gets one duplicate request and whichever finishes first wins. Hedges are
+capped at LLM_HEDGE_MAX_RATE of all calls so the extra cost stays bounded.
+"""
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional
+
+from src.utils import LATENCY_WINDOW, percentile
+
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "120"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "0") != "0"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1"))
+# No hedging until this many latencies have been observed
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_POOL_SIZE = int(os.getenv("LLM_HEDGE_POOL_SIZE", "32"))
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    # One pool for every caller: callers are created per run/job, threads are not
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=LLM_HEDGE_POOL_SIZE, thread_name_prefix="llm-call")
+        return _pool
+
+
+class CallTimeout(TimeoutError):
+    """An LLM call (including any hedge) did not finish before its deadline."""
+
+
+class HedgedCaller:
+    """
+    Runs `fn(timeout)` with a deadline and optional hedging; thread-safe, one per run/job.
+    Hedges are only counted once they are actually sent.
+    """
+
+    def __init__(self, timeout: float = LLM_CALL_TIMEOUT, hedge: bool = LLM_HEDGE,
+                 percentile: float = LLM_HEDGE_PERCENTILE, max_rate: float = LLM_HEDGE_MAX_RATE,
+                 min_samples: int = LLM_HEDGE_MIN_SAMPLES):
+        self.timeout = timeout
+        self.hedge = hedge
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.timeouts = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little latency history."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return percentile(self._latencies, self.percentile)
+
+    def _record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        result = fn()
+        self._record(time.perf_counter() - t0)
+        return result
+
+    def _may_hedge(self) -> bool:
+        # Reserves a hedge; released again if the hedge never gets sent (see _release_hedge)
+        with self._lock:
+            if (self.hedges + 1) > self.max_rate * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def _release_hedge(self) -> None:
+        with self._lock:
+            self.hedges -= 1
+
+    def call(self, fn: Callable[[float], Any]) -> Any:
+        """
+        Run `fn(timeout)` and return its result. `timeout` is the time left until the
+        deadline, for `fn` to use as its request timeout (with client retries off), so an
+        abandoned attempt ends at the deadline. The deadline starts when the call starts
+        running, not while it waits for a pool thread.
+        """
+        with self._lock:
+            self.calls += 1
+        # No hedge while disabled or still warming up: the deadline alone applies
+        delay = self.hedge_delay() if self.hedge else None
+
+        pool = _get_pool()
+        started = threading.Event()
+        finished = threading.Event()
+        started_at = 0.0
+
+        def primary_attempt():
+            nonlocal started_at
+            started_at = time.monotonic()
+            started.set()
+            return self._timed(lambda: fn(self.timeout))
+
+        def hedge_attempt():
+            remaining = deadline - time.monotonic()
+            answered = primary.done() and primary.exception() is None
+            if finished.is_set() or answered or remaining <= 0:
+                # Sat in the queue until the call was over: never sent
+                self._release_hedge()
+                raise CallTimeout("hedge not sent before the deadline")
+            return self._timed(lambda: fn(remaining))
+
+        primary = pool.submit(primary_attempt)
+        started.wait()
+        deadline = started_at + self.timeout
+        first_wait = self.timeout if delay is None else min(delay, self.timeout)
+        done, pending = wait({primary}, timeout=max(0.0, started_at + first_wait - time.monotonic()))
+        hedge = None
+        if not done and delay is not None and time.monotonic() < deadline and self._may_hedge():
+            hedge = pool.submit(hedge_attempt)
+            pending.add(hedge)
+
+        try:
+            error = None
+            while True:
+                for fut in done:
+                    if fut.exception() is None:
+                        if fut is hedge:
+                            with self._lock:
+                                self.hedges_won += 1
+                        return fut.result()
+                    error = fut.exception()
+                if not pending:
+                    raise error
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            with self._lock:
+                self.timeouts += 1
+            raise CallTimeout(f"LLM call exceeded its {self.timeout:g}s deadline")
+        finally:
+            finished.set()
+            if hedge is not None and hedge.cancel():
+                self._release_hedge()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = list(self._latencies)
+            out = {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedges_won": self.hedges_won,
+                "timeouts": self.timeouts,
+            }
+        for p in (50, 95, 99):
+            out[f"p{p}_seconds"] = round(percentile(lat, p), 3) if lat else None
+        return out
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{s['calls']} calls, p50 {s['p50_seconds']}s / p99 {s['p99_seconds']}s, "
+                f"{s['hedges']} hedges ({s['hedges_won']} won), {s['timeouts']} timeouts")
@@ -0,0 +1,303 @@
+# src/jobs.py
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from src.parser import parse_resume_files
+from src.parse_pool import parse_resume_files_isolated, slowest, PARSE_ISOLATED
+from src.prefilter import prefilter_resumes
+from src.rubric_parser import parse_rubric_text
+from src.scorer import ScoringSession, explain_top as explain_top_results
+from src.backends import get_registry
+from src.ranker import aggregate_and_rank
+from src.utils import write_text_atomic
+
+JOBS_DIR = os.getenv("JOBS_DIR", ".jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "0"))  # 0 = unbounded
+JOB_LOG_LINES = 200
+
+ACTIVE_STATUSES = ("queued", "running")
+
+logger = logging.getLogger(__name__)
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    write_text_atomic(path, json.dumps(data, ensure_ascii=False))
+
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class JobStore:
+    """
+    Disk-backed job state: one folder per job holding state.json and results.json.
+    Survives browser refreshes and app restarts; safe to share between threads.
+    """
+
+    def __init__(self, root: str = JOBS_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def job_dir(self, job_id: str) -> str:
+        # job ids are uuid hex; refuse anything that could escape the jobs folder
+        if not job_id or not job_id.isalnum():
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return os.path.join(self.root, job_id)
+
+    def create(self, params: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.job_dir(job_id))
+        now = time.time()
+        state = {
+            "job_id": job_id,
+            "status": "queued",
+            "progress": 0.0,
+            "message": "Queued",
+            "log": [],
+            "error": None,
+            "params": params,
+            "created_at": now,
+            "updated_at": now,
+        }
+        _write_json_atomic(os.path.join(self.job_dir(job_id), "state.json"), state)
+        return job_id
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            path = os.path.join(self.job_dir(job_id), "state.json")
+        except ValueError:
+            return None
+        return _read_json(path)
+
+    def update(self, job_id: str, log: Optional[str] = None, **fields) -> Dict[str, Any]:
+        with self._lock:
+            state = self.load(job_id) or {"job_id": job_id, "log": []}
+            state.update(fields)
+            if log:
+                state["log"] = (state.get("log") or [])[-(JOB_LOG_LINES - 1):] + [log]
+            state["updated_at"] = time.time()
+            _write_json_atomic(os.path.join(self.job_dir(job_id), "state.json"), state)
+            return state
+
+    def save_results(self, job_id: str, results: List[Dict[str, Any]]) -> None:
+        _write_json_atomic(os.path.join(self.job_dir(job_id), "results.json"), results)
+
+    def load_results(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            path = os.path.join(self.job_dir(job_id), "results.json")
+        except ValueError:
+            return None
+        return _read_json(path)
+
+    def append_partial(self, job_id: str, rows: List[Dict[str, Any]]) -> None:
+        """Append rows finished so far to partial.jsonl (one JSON object per line)."""
+        with self._lock:
+            with open(os.path.join(self.job_dir(job_id), "partial.jsonl"), "a", encoding="utf-8") as f:
+                for r in rows:
+                    f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+    def load_partial(self, job_id: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Rows appended after byte `offset`, plus the offset to continue from, so
+        pollers only read what is new. An incomplete last line is left for the next call.
+        """
+        try:
+            with open(os.path.join(self.job_dir(job_id), "partial.jsonl"), "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except (FileNotFoundError, ValueError):
+            return [], offset
+        end = data.rfind(b"\n") + 1
+        rows = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return rows, offset + end
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by JobRunner.submit when the pending-job queue is at capacity."""
+
+
+class JobContext:
+    """Handle passed to a running job for reporting progress back to the store."""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.job_dir = store.job_dir(job_id)
+
+    def progress(self, fraction: float, message: Optional[str] = None, log: Optional[str] = None) -> None:
+        fields = {"progress": max(0.0, min(1.0, float(fraction)))}
+        if message is not None:
+            fields["message"] = message
+        self.store.update(self.job_id, log=log, **fields)
+
+    def log(self, line: str) -> None:
+        self.store.update(self.job_id, log=line)
+
+    def emit(self, row: Dict[str, Any]) -> None:
+        """Publish one finished result before the whole job is done."""
+        self.store.append_partial(self.job_id, [row])
+
+
+class JobRunner:
+    """
+    Runs jobs on background worker threads so work outlives the request/script run
+    that submitted it. Status and results are always read back through the JobStore.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = JOB_WORKERS,
+                 max_queue: int = JOB_MAX_QUEUE):
+        self.store = store or JobStore()
+        self._queue: "queue.Queue[Tuple[str, Callable[[JobContext], List[Dict[str, Any]]]]]" = queue.Queue()
+        # Bounds jobs waiting for a worker; a slot is freed as soon as a worker picks the job up
+        self._slots = threading.BoundedSemaphore(max_queue) if max_queue > 0 else None
+        self._active = set()
+        self._active_lock = threading.Lock()
+        self._threads = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, fn: Callable[[JobContext], List[Dict[str, Any]]], params: Dict[str, Any]) -> str:
+        """Persist a new job and queue `fn(ctx)` to run it. Raises JobQueueFull when at capacity."""
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            raise JobQueueFull("Too many pending jobs, try again later")
+        job_id = self.store.create(params)
+        with self._active_lock:
+            self._active.add(job_id)
+        self._queue.put((job_id, fn))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current job state. Jobs left queued/running by a previous process can never
+        finish, so they are reported as 'interrupted'.
+        """
+        state = self.store.load(job_id)
+        if state and state.get("status") in ACTIVE_STATUSES:
+            with self._active_lock:
+                if job_id not in self._active:
+                    state["status"] = "interrupted"
+                    state["message"] = "Interrupted: the app restarted before this job finished"
+        return state
+
+    def results(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        return self.store.load_results(job_id)
+
+    def partial(self, job_id: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Results a running job has finished since `offset` (see JobStore.load_partial)."""
+        return self.store.load_partial(job_id, offset)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            job_id, fn = self._queue.get()
+            if self._slots is not None:
+                self._slots.release()
+            ctx = JobContext(self.store, job_id)
+            try:
+                self.store.update(job_id, status="running", message="Starting...")
+                results = fn(ctx)
+                self.store.save_results(job_id, results)
+                self.store.update(job_id, status="done", progress=1.0, message="Processing complete!")
+            except Exception as e:
+                logger.exception("Job %s failed", job_id)
+                self.store.update(
+                    job_id, status="failed", message="Processing failed",
+                    error={"type": type(e).__name__, "details": str(e)},
+                    log=f"❌ {type(e).__name__}: {e}",
+                )
+            finally:
+                with self._active_lock:
+                    self._active.discard(job_id)
+                self._queue.task_done()
+
+
+def screening_job(files: List[Tuple[str, bytes]], jd_text: str, rubric_text: str, top_k: int,
+                  resumes: Optional[List[Dict[str, Any]]] = None,
+                  rubric: Optional[Dict[str, Any]] = None,
+                  model: Optional[str] = None,
+                  explain_top: Optional[int] = None) -> Callable[[JobContext], List[Dict[str, Any]]]:
+    """
+    Build the full screening pipeline as a job function: parse -> prefilter ->
+    rubric -> LLM scoring -> rank. `files` are (filename, bytes) pairs parsed from memory;
+    already-extracted `resumes` ({"filename","text"}) are screened alongside them.
+    Pass a pre-parsed `rubric` to skip the rubric LLM call; `model` overrides OPENAI_MODEL_SCORE.
+    With `explain_top`, scoring is two-pass: scores only, then reasons/evidence for the top `explain_top`.
+    """
+    extra_resumes = resumes or []
+
+    def run(ctx: JobContext) -> List[Dict[str, Any]]:
+        # 1) Parse resumes (progress reported in batches, not per file)
+        ctx.progress(0.0, "📄 Parsing resumes...", log=f"🔍 Parsing {len(files)} files..." if files else None)
+        parse = parse_resume_files_isolated if PARSE_ISOLATED else parse_resume_files
+        parsed = parse(
+            files,
+            on_progress=lambda done, total: ctx.progress(
+                done / total * 0.3, f"📄 Parsing resumes... ({done}/{total})"
+            ),
+        )
+        if PARSE_ISOLATED and parsed:
+            ctx.log("⏱️ Slowest files to parse: " + ", ".join(f"{n} ({s:.2f}s)" for n, s in slowest(parsed)))
+        resumes = parsed + extra_resumes
+        failed = [r["filename"] for r in resumes if r["text"].startswith("ERROR")]
+        ctx.log(f"✅ Successfully parsed {len(resumes)} resumes")
+        if failed:
+            ctx.log(f"⚠️ {len(failed)} files had parsing issues but will still be processed: {', '.join(failed)}")
+
+        # 2) Prefilter
+        ctx.progress(0.3, "🔍 Prefiltering with TF-IDF...", log=f"🎯 Prefiltering to top {top_k} resumes...")
+        shortlisted = prefilter_resumes(resumes, jd_text, top_k=top_k)
+        ctx.log(f"✅ Shortlisted {len(shortlisted)} resumes for LLM scoring")
+
+        # 3) Parse rubric once for the whole job
+        job_rubric = rubric
+        if job_rubric is None:
+            ctx.progress(0.4, "📊 Parsing rubric...", log="📊 Parsing scoring rubric with LLM...")
+            job_rubric = parse_rubric_text(rubric_text)
+        if job_rubric.get("error"):
+            ctx.log(f"⚠️ Rubric parsing issue: {job_rubric['error']}")
+        else:
+            ctx.log(f"✅ Rubric ready: {len(job_rubric.get('dimensions', []))} dimensions")
+
+        # 4) Score with LLM (prompt/schema compiled once per job)
+        session = ScoringSession(jd_text, job_rubric, model=model)
+        ctx.progress(0.5, "🤖 Scoring with LLM...", log="🤖 Starting LLM scoring (this may take a few minutes)...")
+        results = []
+        for i, resume in enumerate(shortlisted):
+            results.append(session.score(resume, explain=explain_top is None))
+            ctx.emit(results[-1])
+            ctx.progress(
+                0.5 + (i + 1) / len(shortlisted) * 0.4,
+                f"🤖 Scoring with LLM... ({i + 1}/{len(shortlisted)})",
+                log=f"   ✅ Completed: {resume['filename']}",
+            )
+
+        # 5) Rank
+        ctx.progress(0.95, "📈 Ranking results...")
+        ranked = aggregate_and_rank(results)
+        if explain_top is not None:
+            ctx.progress(0.95, "📝 Explaining top results...", log=f"📝 Generating reasons for the top {explain_top}...")
+            stats = explain_top_results(session, ranked, shortlisted, explain_top)
+            ctx.log(f"✅ Explained {stats['explained']} finalists; ~{stats['est_saved_tokens']} completion tokens saved")
+        ctx.log(f"✅ Final ranking complete! {len(ranked)} resumes scored.")
+        ctx.log(f"🧮 Completion tokens: {sum(r.get('completion_tokens', 0) for r in results)}")
+        ctx.log(f"⏱️ LLM calls: {session.caller.summary()}")
+        ctx.log(f"🔀 Backends (since start): {get_registry().summary()}")
+        return ranked
+
+    return run
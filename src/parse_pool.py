@@ -0,0 +1,229 @@
+# src/parse_pool.py
+"""
+Isolated, time- and memory-limited text extraction.
+
+Each file is parsed in a separate worker process with a wall-time limit
+(PARSE_TIMEOUT) and, on POSIX, an address-space limit (PARSE_MEMORY_MB).
+A worker that overruns is killed and replaced, and the file gets an
+"ERROR_<KIND>_PARSE: timeout" style result. Workers are recycled after
+PARSE_RECYCLE_AFTER files to contain leaks in the PDF/DOCX libraries.
+"""
+import os
+import time
+import queue
+import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.parser import (
+    parse_resume_bytes, parse_resume_file, is_supported, list_resume_files, PARSE_MAX_CHARS, PARSE_MAX_PAGES,
+)
+
+PARSE_ISOLATED = os.getenv("PARSE_ISOLATED", "1") != "0"
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "30"))
+PARSE_MEMORY_MB = int(os.getenv("PARSE_MEMORY_MB", "1024"))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_RECYCLE_AFTER = int(os.getenv("PARSE_RECYCLE_AFTER", "50"))
+
+logger = logging.getLogger(__name__)
+
+# spawn: safe to start from threaded hosts (Streamlit, the HTTP service)
+_ctx = mp.get_context("spawn")
+
+
+def _error_prefix(filename: str) -> str:
+    lower = filename.lower()
+    if lower.endswith(".pdf"):
+        return "ERROR_PDF_PARSE"
+    if lower.endswith(".docx"):
+        return "ERROR_DOCX_PARSE"
+    return "ERROR_TXT_PARSE"
+
+
+def _limit_memory(memory_mb: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Windows: wall-time limit only
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, memory_mb: int, max_chars: int, max_pages: int) -> None:
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        filename, source = msg
+        try:
+            if isinstance(source, bytes):
+                text = parse_resume_bytes(filename, source, max_chars, max_pages)
+            else:
+                text = parse_resume_file(source, max_chars, max_pages)
+        except MemoryError:
+            text = f"{_error_prefix(filename)}: memory limit exceeded"
+        except Exception as e:
+            text = f"{_error_prefix(filename)}: {e}"
+        conn.send(text)
+
+
+class _Worker:
+    def __init__(self, memory_mb: int, max_chars: int = 0, max_pages: int = 0):
+        self.conn, child_conn = _ctx.Pipe()
+        self.process = _ctx.Process(target=_worker_main, args=(child_conn, memory_mb, max_chars, max_pages),
+                                    daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.files_done = 0
+
+    def parse(self, filename: str, source: Union[str, bytes], timeout: float) -> Tuple[str, Optional[str]]:
+        """("ok", text), ("timeout", None) or ("crashed", None)."""
+        try:
+            self.conn.send((filename, source))
+            if not self.conn.poll(timeout):
+                return "timeout", None
+            text = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(timeout=1)
+            return "crashed", None
+        self.files_done += 1
+        return "ok", text
+
+    def stop(self, kill: bool = False) -> None:
+        if not kill:
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, BrokenPipeError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """Pool of isolated parse workers; use as a context manager."""
+
+    def __init__(self, workers: int = PARSE_WORKERS, timeout: float = PARSE_TIMEOUT,
+                 memory_mb: int = PARSE_MEMORY_MB, recycle_after: int = PARSE_RECYCLE_AFTER,
+                 max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES):
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_chars = max_chars
+        self.max_pages = max_pages
+        self.recycle_after = max(1, recycle_after)
+        self.size = max(1, workers)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(self._new_worker())
+
+    def _new_worker(self) -> _Worker:
+        return _Worker(self.memory_mb, self.max_chars, self.max_pages)
+
+    def parse(self, filename: str, source: Union[str, bytes]) -> Tuple[str, float]:
+        """Parse one file (path or bytes) in a worker; returns (text, seconds)."""
+        worker = self._idle.get()
+        t0 = time.perf_counter()
+        try:
+            status, text = worker.parse(filename, source, self.timeout)
+            elapsed = time.perf_counter() - t0
+            if status != "ok":
+                exitcode = worker.process.exitcode
+                worker.stop(kill=True)
+                worker = self._new_worker()
+                if status == "timeout":
+                    text = f"{_error_prefix(filename)}: timeout after {self.timeout:g}s"
+                else:
+                    text = f"{_error_prefix(filename)}: worker crashed (exit code {exitcode})"
+                logger.warning("Parse failed for %s: %s", filename, text)
+            elif worker.files_done >= self.recycle_after:
+                worker.stop()
+                worker = self._new_worker()
+            return text or "", elapsed
+        finally:
+            self._idle.put(worker)
+
+    def parse_many(self, items: List[Tuple[str, Union[str, bytes]]],
+                   on_progress: Optional[Callable[[int, int], None]] = None,
+                   progress_every: int = 25) -> List[Tuple[str, float]]:
+        """Parse (filename, path-or-bytes) items concurrently; results keep input order."""
+        total = len(items)
+        done = 0
+        results: List[Tuple[str, float]] = [("", 0.0)] * total
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            futures = {ex.submit(self.parse, name, source): i for i, (name, source) in enumerate(items)}
+            for fut in futures:
+                results[futures[fut]] = fut.result()
+                done += 1
+                if on_progress and (done % progress_every == 0 or done == total):
+                    on_progress(done, total)
+        return results
+
+    def close(self) -> None:
+        while not self._idle.empty():
+            self._idle.get().stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_resumes_isolated(folder: str, include: Optional[Callable[[str], bool]] = None,
+                          pool: Optional[ParsePool] = None, chunk_size: int = 0) -> Iterator[Dict[str, object]]:
+    """
+    Like parse_resumes_isolated, but yields results in order, `chunk_size` files
+    at a time (default: 8 per worker), so callers can stream them into a ResumeStore.
+    """
+    items = list_resume_files(folder, include)
+
+    own_pool = pool is None
+    pool = pool or ParsePool(workers=min(PARSE_WORKERS, max(1, len(items))))
+    chunk_size = chunk_size or 8 * pool.size
+    try:
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            for (name, path), (text, secs) in zip(chunk, pool.parse_many(chunk)):
+                yield {"filename": name, "path": path, "text": text, "parse_seconds": round(secs, 4)}
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def parse_resumes_isolated(folder: str, include: Optional[Callable[[str], bool]] = None,
+                           pool: Optional[ParsePool] = None) -> List[Dict[str, object]]:
+    """Like parser.parse_resumes, but each file is parsed in an isolated worker; adds parse_seconds."""
+    return list(iter_resumes_isolated(folder, include, pool))
+
+
+def parse_resume_files_isolated(files: List[Tuple[str, bytes]],
+                                on_progress: Optional[Callable[[int, int], None]] = None,
+                                pool: Optional[ParsePool] = None) -> List[Dict[str, object]]:
+    """Like parser.parse_resume_files (in-memory bytes), but isolated; adds parse_seconds."""
+    items = sorted((f for f in files if is_supported(f[0])), key=lambda f: f[0])
+
+    own_pool = pool is None
+    pool = pool or ParsePool(workers=min(PARSE_WORKERS, max(1, len(items))))
+    try:
+        parsed = pool.parse_many(items, on_progress=on_progress)
+    finally:
+        if own_pool:
+            pool.close()
+    return [
+        {"filename": name, "path": None, "text": text, "parse_seconds": round(secs, 4)}
+        for (name, _), (text, secs) in zip(items, parsed)
+    ]
+
+
+def slowest(resumes: List[Dict[str, object]], n: int = 5) -> List[Tuple[str, float]]:
+    """The n slowest files by parse_seconds, for spotting pathological inputs."""
+    timed = [(r["filename"], r.get("parse_seconds", 0.0)) for r in resumes]
+    return sorted(timed, key=lambda x: x[1], reverse=True)[:n]
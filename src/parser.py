@@ -1,54 +1,139 @@
+import io
 import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from PyPDF2 import PdfReader
 import docx
 
-def _parse_pdf(path: str) -> str:
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Extraction budgets (0 = unbounded). Reading stops once either is reached, so
+# long CVs don't pay for pages the scorer (MAX_RESUME_CHARS) would discard anyway.
+PARSE_MAX_CHARS = int(os.getenv("PARSE_MAX_CHARS", "0"))
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "0"))
+
+def _join_bounded(chunks: Iterable[str], max_chars: int = 0, max_units: int = 0, sep: str = " ") -> str:
+    """Join text chunks (pages/paragraphs) lazily, stopping at the char or unit budget."""
+    parts, size = [], 0
+    for i, chunk in enumerate(chunks, 1):
+        parts.append(chunk)
+        size += len(chunk) + 1
+        if (max_chars and size >= max_chars) or (max_units and i >= max_units):
+            break
+    text = sep.join(parts).strip()
+    return text[:max_chars] if max_chars else text
+
+def _parse_pdf(src, max_chars: int = 0, max_pages: int = 0) -> str:
+    """`src` is a path or a binary file-like object."""
     try:
-        reader = PdfReader(path)
-        return " ".join((page.extract_text() or "") for page in reader.pages).strip()
+        reader = PdfReader(src)
+        return _join_bounded(((page.extract_text() or "") for page in reader.pages), max_chars, max_pages)
     except Exception as e:
         return f"ERROR_PDF_PARSE: {e}"
 
-def _parse_docx(path: str) -> str:
+def _parse_docx(src, max_chars: int = 0, max_pages: int = 0) -> str:
+    """`src` is a path or a binary file-like object. DOCX has no pages; only max_chars applies."""
     try:
-        d = docx.Document(path)
-        return " ".join(p.text for p in d.paragraphs).strip()
+        d = docx.Document(src)
+        # one line per paragraph keeps section headings detectable (src.profile_extract)
+        return _join_bounded((p.text for p in d.paragraphs), max_chars, sep="\n")
     except Exception as e:
         return f"ERROR_DOCX_PARSE: {e}"
 
-def _parse_txt(path: str) -> str:
+def _parse_txt(path: str, max_chars: int = 0) -> str:
     try:
         with open(path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+            return f.read(max_chars or -1).strip()
+    except Exception as e:
+        return f"ERROR_TXT_PARSE: {e}"
+
+def _parse_txt_bytes(data: bytes, max_chars: int = 0) -> str:
+    try:
+        text = data.decode("utf-8").strip()
+        return text[:max_chars] if max_chars else text
     except Exception as e:
         return f"ERROR_TXT_PARSE: {e}"
 
-def parse_resumes(folder: str):
+def is_supported(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+def parse_resume_bytes(filename: str, data: bytes,
+                       max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES) -> str:
+    """Extract text from an in-memory .pdf/.docx/.txt file (no disk copy)."""
+    lower = filename.lower()
+    if lower.endswith(".pdf"):
+        text = _parse_pdf(io.BytesIO(data), max_chars, max_pages)
+    elif lower.endswith(".docx"):
+        text = _parse_docx(io.BytesIO(data), max_chars)
+    else:
+        text = _parse_txt_bytes(data, max_chars)
+    return text or ""
+
+def parse_resume_files(
+    files: Iterable[Tuple[str, bytes]],
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    progress_every: int = 25,
+    max_chars: int = PARSE_MAX_CHARS,
+    max_pages: int = PARSE_MAX_PAGES,
+) -> List[Dict[str, str]]:
     """
-    Return list of {"filename","path","text"} for .pdf/.docx/.txt files.
+    Parse (filename, bytes) pairs from memory, e.g. uploaded files.
+    Return list of {"filename","path","text"} (path is None) in filename order,
+    skipping unsupported extensions like parse_resumes does.
+    `on_progress(done, total)` is called every `progress_every` files and at the end.
     """
+    items = sorted((f for f in files if is_supported(f[0])), key=lambda f: f[0])
+    total = len(items)
     resumes = []
+    for i, (filename, data) in enumerate(items, 1):
+        resumes.append({
+            "filename": filename,
+            "path": None,
+            "text": parse_resume_bytes(filename, data, max_chars, max_pages)
+        })
+        if on_progress and (i % progress_every == 0 or i == total):
+            on_progress(i, total)
+    return resumes
+
+def parse_resume_file(path: str, max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES) -> str:
+    """Extract text from one .pdf/.docx/.txt file on disk."""
+    lower = path.lower()
+    if lower.endswith(".pdf"):
+        text = _parse_pdf(path, max_chars, max_pages)
+    elif lower.endswith(".docx"):
+        text = _parse_docx(path, max_chars)
+    else:
+        text = _parse_txt(path, max_chars)
+    return text or ""
+
+def list_resume_files(folder: str, include: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, str]]:
+    """(filename, path) of the supported files parse_resumes would parse, in filename order."""
+    items = []
     for file in sorted(os.listdir(folder)):
         path = os.path.join(folder, file)
         if not os.path.isfile(path):
             continue
-        lower = file.lower()
-        if not (lower.endswith(".pdf") or lower.endswith(".docx") or lower.endswith(".txt")):
+        if not is_supported(file):
             continue
+        if include is not None and not include(path):
+            continue
+        items.append((file, path))
+    return items
 
-        if lower.endswith(".pdf"):
-            text = _parse_pdf(path)
-        elif lower.endswith(".docx"):
-            text = _parse_docx(path)
-        else:
-            text = _parse_txt(path)
-
-        if not text:
-            text = ""
-
-        resumes.append({
+def iter_resumes(folder: str, include: Optional[Callable[[str], bool]] = None,
+                 max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES) -> Iterator[Dict[str, str]]:
+    """Like parse_resumes, but yields one {"filename","path","text"} at a time."""
+    for file, path in list_resume_files(folder, include):
+        yield {
             "filename": file,
             "path": path,
-            "text": text
-        })
-    return resumes
+            "text": parse_resume_file(path, max_chars, max_pages)
+        }
+
+def parse_resumes(folder: str, include: Optional[Callable[[str], bool]] = None,
+                  max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES):
+    """
+    Return list of {"filename","path","text"} for .pdf/.docx/.txt files.
+    `include(path)` can restrict which files are parsed (e.g. one shard of the folder).
+    `max_chars`/`max_pages` stop extraction early (0 = read everything).
+    """
+    return list(iter_resumes(folder, include, max_chars, max_pages))
@@ -0,0 +1,155 @@
+# src/pipeline.py
+"""
+Pipelined screening: parsing, prefiltering and LLM scoring overlap.
+
+Each resume gets a streaming prefilter score as soon as it is parsed: cosine
+similarity of its term frequencies to the JD, using the JD's own vocabulary
+(no corpus statistics needed). Once PIPELINE_WARMUP resumes have been seen,
+a resume is admitted to the scoring pool when its streaming score is in the
+top PIPELINE_ADMIT_SLACK * k/N of the scores seen so far, so LLM calls run
+while parsing continues.
+
+When parsing is done the exact corpus TF-IDF prefilter runs as in a normal
+run. Shortlisted resumes that were not admitted are scored then; admitted ones
+that missed the shortlist are cancelled if not yet started and dropped
+otherwise, so the output is the same exact top-k as a non-pipelined run.
+"""
+import os
+import math
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.prefilter import PrefilterModel, top_k_indices
+
+# Concurrent LLM scoring calls in pipelined mode
+PIPELINE_SCORE_WORKERS = int(os.getenv("PIPELINE_SCORE_WORKERS", "8"))
+# Resumes seen before the admission threshold is trusted
+PIPELINE_WARMUP = int(os.getenv("PIPELINE_WARMUP", "50"))
+# Admit the top (slack * k / N) fraction by streaming score; >1 trades extra calls for fewer late ones
+PIPELINE_ADMIT_SLACK = float(os.getenv("PIPELINE_ADMIT_SLACK", "1.5"))
+# Recompute the admission threshold every this many resumes
+THRESHOLD_EVERY = 16
+
+
+class JDVectorizer:
+    """Streaming prefilter score: TF cosine to the JD over the JD's vocabulary."""
+
+    def __init__(self, jd_text: str):
+        vectorizer = TfidfVectorizer(stop_words="english", use_idf=False)
+        jd_vec = vectorizer.fit_transform([jd_text]).toarray().ravel()
+        self.analyzer = vectorizer.build_analyzer()
+        self.weights = dict(zip(vectorizer.get_feature_names_out(), jd_vec))
+
+    def score(self, text: str) -> float:
+        counts = Counter(self.analyzer(text))
+        # Normalised over all of the resume's terms, so off-topic text dilutes the score
+        norm = math.sqrt(sum(c * c for c in counts.values()))
+        if not norm:
+            return 0.0
+        dot = sum(c * self.weights[t] for t, c in counts.items() if t in self.weights)
+        return dot / norm
+
+
+class Admission:
+    """Admission threshold: the (1 - slack*k/N) quantile of streaming scores seen so far."""
+
+    def __init__(self, top_k: int, total: int, warmup: int = PIPELINE_WARMUP, slack: float = PIPELINE_ADMIT_SLACK):
+        self.fraction = min(1.0, slack * top_k / max(1, total))
+        self.warmup = max(1, min(warmup, total))
+        self.scores: List[float] = []
+        self.threshold: Optional[float] = None
+
+    def observe(self, score: float) -> None:
+        self.scores.append(score)
+        n = len(self.scores)
+        if n >= self.warmup and (self.threshold is None or n % THRESHOLD_EVERY == 0):
+            self.threshold = float(np.quantile(self.scores, 1.0 - self.fraction))
+
+    def admits(self, score: float) -> bool:
+        # Strict, so a threshold sitting on a mass of ties (e.g. zero overlap) admits none of them
+        return self.threshold is not None and score > self.threshold
+
+
+def run_pipeline(resumes: Iterable[Dict[str, Any]], total: int, jd_text: str, session, top_k: int,
+                 explain: bool = True, workers: int = PIPELINE_SCORE_WORKERS,
+                 on_progress: Optional[Callable[[str, int, int], None]] = None,
+                 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Parse/prefilter/score `resumes` (a stream of parser dicts, `total` expected)
+    with speculative early scoring. Returns (shortlisted resumes best first with
+    exact prefilter_score, their scoring results in the same order, stats).
+    `on_progress(stage, done, total)` is called with stage "parse" and then "score".
+    """
+    jd = JDVectorizer(jd_text)
+    admission = Admission(top_k, total)
+    parsed: List[Dict[str, Any]] = []
+    futures: Dict[int, Any] = {}
+    held: List[Tuple[int, float]] = []  # seen during warmup, before the threshold exists
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pipeline-score") as pool:
+        def admit(i: int) -> None:
+            futures[i] = pool.submit(session.score, parsed[i], explain)
+
+        for r in resumes:
+            i = len(parsed)
+            parsed.append(r)
+            s = jd.score(r["text"])
+            was_warm = admission.threshold is not None
+            admission.observe(s)
+            if not was_warm:
+                held.append((i, s))
+                if admission.threshold is not None:
+                    for j, hs in held:
+                        if admission.admits(hs):
+                            admit(j)
+                    held = []
+            elif admission.admits(s):
+                admit(i)
+            if on_progress:
+                on_progress("parse", len(parsed), total)
+        early = set(futures)
+
+        # Exact prefilter over the whole pool, as in a non-pipelined run
+        sims = PrefilterModel(jd_text, (r["text"] for r in parsed)).corpus_scores if parsed else np.zeros(0)
+        idx = [int(i) for i in top_k_indices(sims, top_k)]
+        keep = set(idx)
+
+        cancelled = sum(1 for i, fut in futures.items() if i not in keep and fut.cancel())
+        for i in idx:
+            if i not in futures:
+                admit(i)
+
+        shortlisted, results = [], []
+        done_lock = threading.Lock()
+        done = [0]
+
+        def _count(_):
+            with done_lock:
+                done[0] += 1
+                if on_progress:
+                    on_progress("score", done[0], len(idx))
+
+        for i in idx:
+            futures[i].add_done_callback(_count)
+        for i in idx:
+            r = parsed[i]
+            r["prefilter_score"] = float(sims[i])
+            result = futures[i].result()
+            result["prefilter_score"] = r["prefilter_score"]
+            shortlisted.append(r)
+            results.append(result)
+
+    stats = {
+        "parsed": len(parsed),
+        "admitted_early": len(early),
+        "early_in_top_k": len(early & keep),
+        "scored_late": len(keep - early),
+        "wasted_calls": len(early - keep) - cancelled,
+        "cancelled": cancelled,
+    }
+    return shortlisted, results, stats
@@ -1,34 +1,157 @@
 # src/prefilter.py
-from sklearn.feature_extraction.text import TfidfVectorizer
+import os
+import heapq
+from itertools import chain, islice
+
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import numpy as np
 
+# Out-of-core prefilter: hashed feature space size and resumes vectorized per batch
+PREFILTER_HASH_FEATURES = int(os.getenv("PREFILTER_HASH_FEATURES", str(2 ** 20)))
+PREFILTER_BATCH_SIZE = int(os.getenv("PREFILTER_BATCH_SIZE", "1000"))
+
+class PrefilterModel:
+    """
+    TF-IDF model fitted on the job description plus a resume corpus.
+    Kept around so new resumes can be scored later without refitting.
+    """
+
+    def __init__(self, jd_text, corpus_texts=()):
+        self.vectorizer = TfidfVectorizer(stop_words="english")
+        # corpus_texts may be a generator (e.g. ResumeStore.iter_texts()); it is consumed once
+        tfidf = self.vectorizer.fit_transform(chain([jd_text], corpus_texts))
+        self.jd_vec = tfidf[0:1]
+        # Scores for the fitting corpus, same as transforming it again
+        self.corpus_scores = cosine_similarity(self.jd_vec, tfidf[1:]).flatten() if tfidf.shape[0] > 1 else np.zeros(0)
+
+    def score(self, texts):
+        """Cosine similarity of each text to the JD under the fitted vocabulary/IDF."""
+        if not texts:
+            return np.zeros(0)
+        return cosine_similarity(self.jd_vec, self.vectorizer.transform(texts)).flatten()
+
+class HashingPrefilterModel:
+    """
+    Fixed-memory counterpart of PrefilterModel: terms are hashed into n_features
+    buckets (no vocabulary), and IDF comes from document frequencies accumulated
+    batch by batch with partial_fit. Same tokenization, smoothed IDF and l2
+    normalization as TfidfVectorizer, so scores match up to hash collisions.
+    """
+
+    def __init__(self, jd_text, n_features=PREFILTER_HASH_FEATURES):
+        self.vectorizer = HashingVectorizer(n_features=n_features, stop_words="english",
+                                            alternate_sign=False, norm=None)
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self._jd_counts = self.vectorizer.transform([jd_text])
+        self._add_counts(self._jd_counts)  # the JD is part of the corpus, as in PrefilterModel
+
+    def _add_counts(self, counts):
+        counts.sum_duplicates()
+        self.df += np.bincount(counts.indices, minlength=self.df.shape[0])
+        self.n_docs += counts.shape[0]
+        self._idf = self._jd_vec = None
+
+    def partial_fit(self, texts):
+        """Pass 1: count document frequencies for one batch of texts."""
+        self._add_counts(self.vectorizer.transform(texts))
+        return self
+
+    def _tfidf(self, counts):
+        counts = counts.tocsr().astype(np.float64)
+        counts.data *= self._idf[counts.indices]
+        return normalize(counts)
+
+    def score(self, texts):
+        """Pass 2: cosine similarity of each text to the JD under the accumulated IDF."""
+        if not texts:
+            return np.zeros(0)
+        if self._jd_vec is None:
+            # Smoothed IDF, as TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+            self._idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+            self._jd_vec = self._tfidf(self._jd_counts).T.tocsc()
+        return (self._tfidf(self.vectorizer.transform(texts)) @ self._jd_vec).toarray().ravel()
+
+def _batches(texts, batch_size):
+    it = iter(texts)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def top_k_indices(scores, top_k):
+    """
+    Indices of the top_k scores, best first (ties by index), via argpartition:
+    O(n) selection plus a sort of only the k winners.
+    """
+    scores = np.asarray(scores, dtype=float)
+    k = min(max(0, top_k), len(scores))
+    if k == 0:
+        return np.zeros(0, dtype=int)
+    idx = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    # argpartition doesn't break ties by index; make the boundary deterministic
+    cutoff = scores[idx].min()
+    idx = np.concatenate([np.flatnonzero(scores > cutoff), np.flatnonzero(scores == cutoff)])[:k]
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+def prefilter_store(store, jd_text, top_k=100):
+    """
+    Prefilter a ResumeStore without materializing the pool: texts are streamed
+    from the store into TF-IDF. Returns (shortlisted indices best first, all scores).
+    """
+    scores = PrefilterModel(jd_text, store.iter_texts()).corpus_scores
+    return top_k_indices(scores, top_k), scores
+
+def prefilter_store_out_of_core(store, jd_text, top_k=100, batch_size=PREFILTER_BATCH_SIZE,
+                                n_features=PREFILTER_HASH_FEATURES):
+    """
+    Prefilter a ResumeStore in fixed memory: one streaming pass for document
+    frequencies, a second to score, keeping only a top_k heap of (score, index).
+    Returns (shortlisted indices best first, their scores), like prefilter_store
+    but without an array of every score.
+    """
+    if top_k <= 0:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    model = HashingPrefilterModel(jd_text, n_features)
+    for batch in _batches(store.iter_texts(), batch_size):
+        model.partial_fit(batch)
+
+    heap = []  # min-heap of (score, -index): worst kept entry first, later index loses ties
+    start = 0
+    for batch in _batches(store.iter_texts(), batch_size):
+        scores = model.score(batch)
+        floor = heap[0][0] if len(heap) >= top_k else -np.inf
+        for j in np.flatnonzero(scores >= floor):
+            entry = (float(scores[j]), -(start + int(j)))
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        start += len(batch)
+    best = sorted(heap, reverse=True)
+    return np.array([-i for _, i in best], dtype=int), np.array([s for s, _ in best])
+
 def prefilter_resumes(resumes, jd_text, top_k=100):
     """
     Prefilter resumes using TF-IDF similarity against the job description.
-    
+
     Args:
         resumes (list of dict): [{"filename": str, "text": str}, ...]
         jd_text (str): Job description text
         top_k (int): Number of resumes to shortlist
 
     Returns:
-        list of dict: Shortlisted resumes with added prefilter_score
+        list of dict: Shortlisted resumes (best first) with added prefilter_score
     """
-    texts = [jd_text] + [r["text"] for r in resumes]
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf = vectorizer.fit_transform(texts)
+    sims = PrefilterModel(jd_text, (r["text"] for r in resumes)).corpus_scores
 
-    # First vector is JD, rest are resumes
-    jd_vec = tfidf[0:1]
-    resume_vecs = tfidf[1:]
-    sims = cosine_similarity(jd_vec, resume_vecs).flatten()
-
-    # Attach scores
-    for i, r in enumerate(resumes):
+    # Top-k selection instead of a full sort; only shortlisted dicts get a score
+    shortlisted = []
+    for i in top_k_indices(sims, top_k):
+        r = resumes[i]
         r["prefilter_score"] = float(sims[i])
-
-    # Sort by score
-    ranked = sorted(resumes, key=lambda x: x["prefilter_score"], reverse=True)
-
-    return ranked[:top_k]
+        shortlisted.append(r)
+    return shortlisted
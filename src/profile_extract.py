@@ -0,0 +1,259 @@
+# src/profile_extract.py
+"""
+Local, deterministic extraction of resume profile fields.
+
+Fills the contact, education and work-history fields of the scoring schema
+with regex/section heuristics so the LLM does not have to generate them.
+Only fields resolved with reasonable confidence are returned; everything
+else stays in the LLM schema (see ScoringSession).
+"""
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.contact_norm import detect_contacts, choose_primary
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+# Whole month names or their abbreviations only, so "Novartis" or "Summary" are not read as months
+_MONTH_NAME = (r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+               r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?")
+_YEAR = r"(?:19|20)\d{2}"
+_DATE = rf"(?:{_MONTH_NAME}\s*'?,?\s*{_YEAR}|\d{{1,2}}\s*[/\-.]\s*{_YEAR}|{_YEAR})"
+_PRESENT = r"(?:present|current|now|till\s+date|to\s+date|ongoing)"
+RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|till|until)\s*(?P<end>{_DATE}|{_PRESENT})\b",
+    re.I,
+)
+YEAR_RE = re.compile(rf"\b{_YEAR}\b")
+
+# Heading line -> section name
+_SECTION_HEADINGS = {
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship", "career history"),
+    "education": ("education", "academics", "academic background", "educational qualifications",
+                  "qualifications", "academic qualifications"),
+    "other": ("projects", "skills", "technical skills", "certifications", "achievements", "awards",
+              "publications", "summary", "profile", "objective", "interests", "hobbies", "languages",
+              "personal details", "extracurricular activities", "volunteering", "references"),
+}
+_HEADING_TO_SECTION = {h: s for s, hs in _SECTION_HEADINGS.items() for h in hs}
+
+_DEGREE_LEVELS = (
+    ("PhD", re.compile(r"\b(?:ph\.?\s?d|doctor of philosophy|doctorate)\b", re.I)),
+    ("PG", re.compile(r"\b(?:m\.?\s?tech|m\.?\s?e\.|m\.?\s?sc|m\.?\s?s\.|mba|mca|m\.?\s?com|pgdm|master(?:'?s)?)\b", re.I)),
+    ("UG", re.compile(r"\b(?:b\.?\s?tech|b\.?\s?e\.|b\.?\s?sc|bca|b\.?\s?com|bba|b\.?\s?a\.|bachelor(?:'?s)?)\b", re.I)),
+)
+_INSTITUTION_RE = re.compile(r"\b(?:university|institute|college|iit|nit|iiit|bits|school of|academy)\b", re.I)
+_ROLE_WORD_RE = re.compile(
+    r"\b(?:engineer|developer|intern|manager|analyst|scientist|lead|consultant|architect|designer|"
+    r"researcher|associate|director|officer|specialist|administrator|programmer|head|founder|trainee|"
+    r"executive|assistant|coordinator|owner|partner|technician|representative|accountant|recruiter|"
+    r"teacher|lecturer|professor|writer|editor|student)\b",
+    re.I,
+)
+_ROLE_SPLIT_RE = re.compile(r"\s+at\s+|\s+@\s+|\s*\|\s*|\s+[-–—]\s+|\s*,\s*", re.I)
+_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){1,3}$")
+_NOT_NAME_WORDS = {"resume", "curriculum", "vitae", "cv", "profile", "contact"} | {
+    w for h in _HEADING_TO_SECTION for w in h.split()
+}
+# Lowercase words allowed inside a name ("Ana de la Cruz", "Ahmed bin Salem")
+_NAME_PARTICLES = {"de", "da", "del", "della", "der", "di", "du", "la", "le", "van", "von", "bin", "binti", "al", "el"}
+# Portfolio/code hosting besides github.com; other URLs (employers, certificates, DOIs) are left to the model
+_PORTFOLIO_URL_RE = re.compile(
+    r"^https?://(?:[a-z0-9\-]+\.)*(?:github\.io|gitlab\.com|bitbucket\.org|behance\.net|dribbble\.com|"
+    r"kaggle\.com|huggingface\.co|codepen\.io|vercel\.app|netlify\.app)(?:[/:?#]|$)",
+    re.I,
+)
+# Local values that are more reliable than the model's; other local fields only fill gaps
+AUTHORITATIVE_FIELDS = ("email", "linkedin_link")
+
+
+def _parse_date(s: str, today: date) -> Tuple[Optional[int], Optional[int]]:
+    """(month, year) from one side of a date range; month is None for year-only dates."""
+    s = s.strip().lower()
+    if re.fullmatch(_PRESENT, s):
+        return today.month, today.year
+    year = int(YEAR_RE.search(s).group(0))
+    m = re.match(r"([a-z]+)", s)
+    if m:
+        return _MONTHS.get(m.group(1)[:3]), year
+    m = re.match(r"(\d{1,2})\s*[/\-.]", s)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return int(m.group(1)), year
+    return None, year
+
+
+def _duration_months(sm: Optional[int], sy: int, em: Optional[int], ey: int) -> int:
+    if sm is None or em is None:
+        return max(0, (ey - sy) * 12)
+    return max(0, (ey * 12 + em) - (sy * 12 + sm) + 1)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Section name -> text, for lines recognised as section headings. Text before the first heading is 'header'."""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        key = re.sub(r"[^a-z ]", "", line.strip().lower()).strip()
+        if key in _HEADING_TO_SECTION and len(line.strip()) <= 40:
+            current = _HEADING_TO_SECTION[key]
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return {k: "\n".join(v) for k, v in sections.items()}
+
+
+def _split_title_company(header: str) -> Tuple[Optional[str], Optional[str]]:
+    parts = [p.strip(" ()|,–—-:") for p in _ROLE_SPLIT_RE.split(header)]
+    parts = [p for p in parts if p]
+    if len(parts) < 2:
+        return None, None
+    title, company = parts[0], parts[1]
+    if {title.lower(), company.lower()} & _HEADING_TO_SECTION.keys():
+        return None, None
+    if _ROLE_WORD_RE.search(title):
+        return title, company
+    if _ROLE_WORD_RE.search(company):
+        return company, title
+    return None, None
+
+
+def extract_roles(section: str, today: date) -> List[Dict[str, Any]]:
+    """Roles with a date range from an experience section, most recent first."""
+    roles = []
+    prev = ""
+    for line in section.splitlines():
+        line = line.strip()
+        m = RANGE_RE.search(line)
+        if not m:
+            if line:
+                prev = line
+            continue
+        header = (line[:m.start()] + " " + line[m.end():]).strip(" ()|,–—-:\t")
+        title, company = _split_title_company(header or prev)
+        if (title is None or company is None) and header and prev:
+            title, company = _split_title_company(f"{prev} | {header}")
+        sm, sy = _parse_date(m.group("start"), today)
+        em, ey = _parse_date(m.group("end"), today)
+        roles.append({
+            "title": title,
+            "company": company,
+            "start_month": sm,
+            "start_year": sy,
+            "end_month": em,
+            "end_year": ey,
+            "duration_months": _duration_months(sm, sy, em, ey),
+        })
+        prev = ""
+    roles.sort(key=lambda r: (r["end_year"], r["end_month"] or 12), reverse=True)
+    return roles
+
+
+def _total_years(roles: List[Dict[str, Any]]) -> float:
+    """Experience in years with overlapping roles counted once."""
+    spans = sorted(
+        (start, start + r["duration_months"])
+        for r in roles
+        for start in [r["start_year"] * 12 + (r["start_month"] or 1)]
+    )
+    total, cur_start, cur_end = 0, None, None
+    for s, e in spans:
+        if cur_end is None or s > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = s, e
+        else:
+            cur_end = max(cur_end, e)
+    if cur_end is not None:
+        total += cur_end - cur_start
+    return round(total / 12, 1)
+
+
+def _applicant_name(header: str) -> Optional[str]:
+    """
+    The first header line that looks like a person's name. Job titles ("Senior
+    Data Scientist") and lowercase lines (keyword lists) are rejected; when
+    unsure, nothing is returned and the model extracts the name.
+    """
+    for line in [l.strip() for l in header.splitlines() if l.strip()][:3]:
+        if not _NAME_RE.match(line) or set(line.lower().split()) & _NOT_NAME_WORDS:
+            continue
+        if _ROLE_WORD_RE.search(line):
+            continue
+        if not all(w[0].isupper() or w in _NAME_PARTICLES for w in line.split()):
+            continue
+        return line.title() if line.isupper() else line
+    return None
+
+
+def _education(section: str, today: date) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for level, pattern in _DEGREE_LEVELS:
+        if pattern.search(section):
+            out["education_level"] = level
+            break
+    years = [int(y) for y in YEAR_RE.findall(section) if int(y) <= today.year + 6]
+    if years and "education_level" in out:
+        out["graduation_year"] = max(years)
+    for line in section.splitlines():
+        # "B.Tech, XYZ Institute of Technology, 2015 - 2019": keep the institution part
+        part = next((p for p in re.split(r"\s*[|,;]\s*|\s+[-–—]\s+", RANGE_RE.sub("", line))
+                     if _INSTITUTION_RE.search(p)), None)
+        if part:
+            college = YEAR_RE.sub("", part).strip(" ()|,–—-:\t")
+            if 3 <= len(college) <= 120:
+                out["college"] = college
+                break
+    return out
+
+
+def extract_profile(text: str, filename: Optional[str] = None, detected: Optional[Dict[str, List[str]]] = None,
+                    today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Profile fields resolved locally, keyed like the scoring schema.
+    Fields that could not be resolved confidently are left out.
+    """
+    today = today or date.today()
+    detected = detected if detected is not None else detect_contacts(text)
+    out: Dict[str, Any] = {}
+    if filename:
+        out["resume_file_name"] = filename
+
+    if detected["emails"]:
+        out["email"] = choose_primary(detected["emails"])
+    if detected["phones"]:
+        out["phone"] = choose_primary(detected["phones"])
+    if detected["linkedin"]:
+        out["linkedin_link"] = choose_primary(detected["linkedin"])
+    links = detected["github"] + [u for u in detected["other_urls"] if _PORTFOLIO_URL_RE.match(u)]
+    if links:
+        out["portfolio_github_links"] = links
+
+    sections = split_sections(text)
+    name = _applicant_name(sections.get("header", ""))
+    if name:
+        out["applicant_name"] = name
+    if "education" in sections:
+        out.update(_education(sections["education"], today))
+
+    # Work history only when every dated entry could be attributed to a title and company
+    roles = extract_roles(sections.get("experience", ""), today)
+    if roles and all(r["title"] and r["company"] for r in roles):
+        out["key_roles"] = roles
+        out["total_experience_years"] = _total_years(roles)
+        out["current_or_last_company"] = roles[0]["company"]
+    return out
+
+
+def merge_profile(data: Dict[str, Any], profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge locally extracted `profile` into the model's `data` (in place): email and
+    LinkedIn replace the model's values, other fields only fill what the model left empty.
+    """
+    for k, v in profile.items():
+        if k in AUTHORITATIVE_FIELDS or not data.get(k):
+            data[k] = v
+    return data
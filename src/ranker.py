@@ -1,3 +1,24 @@
+from bisect import bisect_right
+
+
+def ranking_key(r):
+    """
+    Sort key for the final ranking: final_score desc, ties broken by
+    prefilter_score desc then file name, so every ordering is deterministic.
+    """
+    return (
+        -float(r.get("final_score", 0.0)),
+        -float(r.get("prefilter_score", 0.0) or 0.0),
+        str(r.get("resume_file_name") or r.get("filename") or ""),
+    )
+
+
+def _final_score(r, use_total=True):
+    if use_total and isinstance(r.get("total_score"), (int, float)):
+        return float(r["total_score"])
+    return float(r.get("prefilter_score", 0.0))
+
+
 def aggregate_and_rank(results, *, use_total=True):
     """
     Aggregate -> final_score; sort; add rank. Keeps all fields intact.
@@ -6,14 +27,34 @@ def aggregate_and_rank(results, *, use_total=True):
     """
     ranked = []
     for r in results:
-        if use_total and isinstance(r.get("total_score"), (int, float)):
-            final = float(r["total_score"])
-        else:
-            final = float(r.get("prefilter_score", 0.0))
-        r["final_score"] = final
+        r["final_score"] = _final_score(r, use_total)
         ranked.append(r)
 
-    ranked.sort(key=lambda x: x["final_score"], reverse=True)
+    ranked.sort(key=ranking_key)
     for i, r in enumerate(ranked, 1):
         r["rank"] = i
     return ranked
+
+
+def insert_ranked(ranked, r, *, use_total=True):
+    """
+    Insert one scored result into an already-ranked list (as produced by
+    aggregate_and_rank) without re-sorting; ranks from the insert point on are updated.
+    """
+    r["final_score"] = _final_score(r, use_total)
+    pos = bisect_right(ranked, ranking_key(r), key=ranking_key)
+    ranked.insert(pos, r)
+    for i in range(pos, len(ranked)):
+        ranked[i]["rank"] = i + 1
+    return ranked
+
+
+def remove_ranked(ranked, r):
+    """Remove a result (by identity) from a ranked list and renumber ranks after it."""
+    for pos, x in enumerate(ranked):
+        if x is r:
+            del ranked[pos]
+            for i in range(pos, len(ranked)):
+                ranked[i]["rank"] = i + 1
+            return True
+    return False
@@ -0,0 +1,103 @@
+# src/resume_store.py
+"""
+Memory-lean storage for large resume pools.
+
+Metadata lives in small __slots__ records; all extracted text goes to one
+temporary blob file that is memory-mapped for reading and addressed by byte
+offset/length. Text becomes a Python string only when a record is read
+(streamed through the prefilter) or materialized (shortlisted resumes).
+"""
+import os
+import mmap
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+RESUME_STORE_DIR = os.getenv("RESUME_STORE_DIR") or None  # default: system temp dir
+
+
+class ResumeRecord:
+    __slots__ = ("filename", "path", "offset", "length", "parse_seconds")
+
+    def __init__(self, filename: str, path: Optional[str], offset: int, length: int,
+                 parse_seconds: Optional[float] = None):
+        self.filename = filename
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.parse_seconds = parse_seconds
+
+
+class ResumeStore:
+    """Append resumes, then read texts back from a memory-mapped blob; use as a context manager."""
+
+    def __init__(self, directory: Optional[str] = RESUME_STORE_DIR):
+        fd, self.blob_path = tempfile.mkstemp(prefix="resumes-", suffix=".blob", dir=directory)
+        self._file = os.fdopen(fd, "w+b")
+        self._size = 0
+        self._mm: Optional[mmap.mmap] = None
+        self.records: List[ResumeRecord] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, filename: str, path: Optional[str], text: str, parse_seconds: Optional[float] = None) -> int:
+        """Append one resume; returns its index."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self.records.append(ResumeRecord(filename, path, self._size, len(data), parse_seconds))
+        self._size += len(data)
+        return len(self.records) - 1
+
+    def add_all(self, resumes) -> "ResumeStore":
+        """Consume an iterable of parser dicts ({"filename","path","text"[, "parse_seconds"]})."""
+        for r in resumes:
+            self.add(r["filename"], r.get("path"), r["text"], r.get("parse_seconds"))
+        return self
+
+    def _map(self) -> Optional[mmap.mmap]:
+        if self._mm is None and self._size:
+            self._file.flush()
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def text(self, i: int) -> str:
+        rec = self.records[i]
+        mm = self._map()
+        return mm[rec.offset:rec.offset + rec.length].decode("utf-8") if mm is not None else ""
+
+    def iter_texts(self) -> Iterator[str]:
+        """Texts in insertion order, one at a time (for streaming into the prefilter)."""
+        for i in range(len(self.records)):
+            yield self.text(i)
+
+    def materialize(self, i: int, **fields) -> Dict[str, Any]:
+        """Parser-style dict for one record, plus any extra fields (e.g. prefilter_score)."""
+        rec = self.records[i]
+        out = {"filename": rec.filename, "path": rec.path, "text": self.text(i)}
+        if rec.parse_seconds is not None:
+            out["parse_seconds"] = rec.parse_seconds
+        out.update(fields)
+        return out
+
+    def slowest(self, n: int = 5) -> List[Tuple[str, float]]:
+        timed = [(r.filename, r.parse_seconds or 0.0) for r in self.records]
+        return sorted(timed, key=lambda x: x[1], reverse=True)[:n]
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+        try:
+            os.remove(self.blob_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
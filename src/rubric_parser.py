@@ -1,12 +1,11 @@
 import os, json
 from typing import Dict, Any
-from openai import OpenAI
+
+from src.backends import get_registry
 
 RUBRIC_PATH = os.getenv("RUBRIC_PATH", "data/rubric.txt")
 OPENAI_MODEL_PARSE = os.getenv("OPENAI_MODEL_PARSE", "gpt-4o")
 
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 _SYSTEM_PROMPT_PARSE = """You are a precise rubric parser.
 Input: free-form rubric text with multiple dimensions (e.g., "A. Projects ... (30 points)").
 Output: strict JSON.
@@ -36,11 +35,14 @@ def _slugify(title: str) -> str:
 
 
 def parse_rubric(rubric_path: str = RUBRIC_PATH) -> Dict[str, Any]:
-    """LLM-parse rubric text into structured JSON."""
-    rubric_text = _read(rubric_path)
+    """LLM-parse a rubric file into structured JSON."""
+    return parse_rubric_text(_read(rubric_path))
 
+
+def parse_rubric_text(rubric_text: str) -> Dict[str, Any]:
+    """LLM-parse rubric text into structured JSON."""
     try:
-        resp = _client.chat.completions.create(
+        resp = get_registry().chat(
             model=OPENAI_MODEL_PARSE,
             temperature=0,
             response_format={"type":"json_object"},
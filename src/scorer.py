@@ -1,8 +1,9 @@
 # src/scorer.py
 import os
 import json
-from typing import Dict, Any, List
-from openai import OpenAI
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, List, Optional
 
 from src.rubric_parser import parse_rubric
 from src.contact_norm import (
@@ -10,11 +11,24 @@ from src.contact_norm import (
     append_detected_block,
     postprocess_extracted,
 )
+from src.profile_extract import extract_profile, merge_profile
+from src.hedging import HedgedCaller
+from src.backends import get_registry
 
 OPENAI_MODEL_SCORE = os.getenv("OPENAI_MODEL_SCORE", "gpt-4o")
 MAX_RESUME_CHARS = int(os.getenv("MAX_RESUME_CHARS", "5000"))
-
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Strict JSON-schema structured outputs; set to 0 for models that only support json_object mode
+SCORE_STRICT_SCHEMA = os.getenv("SCORE_STRICT_SCHEMA", "1") != "0"
+# Follow-up calls asking only for missing/invalid dimension fields
+SCORE_REPAIR_RETRIES = int(os.getenv("SCORE_REPAIR_RETRIES", "2"))
+# Fill profile fields locally (src.profile_extract) and only ask the LLM for the rest
+SCORE_LOCAL_PROFILE = os.getenv("SCORE_LOCAL_PROFILE", "1") != "0"
+# Two-pass scoring: max_tokens for the scores-only first pass (0 = sized from the rubric)
+SCORE_PASS1_MAX_TOKENS = int(os.getenv("SCORE_PASS1_MAX_TOKENS", "0"))
+# Two-pass scoring: how many top-ranked resumes get reasons/evidence in the second pass
+SCORE_EXPLAIN_TOP = int(os.getenv("SCORE_EXPLAIN_TOP", "10"))
+# Compiled schema/prompt variants kept per session (one per distinct set of locally resolved fields)
+VARIANT_CACHE_SIZE = 64
 
 _SYSTEM_PROMPT_SCORE = """You are a precise resume screener and rubric-driven scorer.
 Use ONLY the resume text and the DETECTED_CONTACTS block for evidence. Do NOT invent data.
@@ -62,140 +76,412 @@ def _base_profile_schema() -> Dict[str, Any]:
         "achievements": {"type": "array", "items": {"type": "string"}},
     }
 
-def _dynamic_schema(dimensions: List[Dict[str, Any]]) -> Dict[str, Any]:
-    props = _base_profile_schema()
+def _dynamic_schema(dimensions: List[Dict[str, Any]], omit: Iterable[str] = (), mode: str = "full") -> Dict[str, Any]:
+    """
+    Scoring schema; `omit` drops profile fields that were already resolved locally.
+    mode: "full" (everything), "scores" (dimension scores + total only, two-pass first pass)
+    or "explain" (profile, reasons, rationale and evidence, two-pass second pass).
+    """
+    omit = set(omit)
+    props = {} if mode == "scores" else {k: v for k, v in _base_profile_schema().items() if k not in omit}
     for d in dimensions:
         letter, key, max_pts = d["id"], d["key"], d["max_points"]
-        props[f"{letter}_{key}_score"] = {"type": "integer"}   # will clamp later
-        props[f"{letter}_{key}_reason"] = {"type": "string"}
-    props.update({
-        "total_score": {"type": "integer"},
-        "rationale": {"type": "string"},
-        "evidence": {"type": "array", "items": {"type": "string"}},
-    })
-    return {"type": "object", "properties": props, "required": ["resume_file_name", "total_score", "evidence"]}
+        if mode != "explain":
+            props[f"{letter}_{key}_score"] = {"type": "integer"}   # will clamp later
+        if mode != "scores":
+            props[f"{letter}_{key}_reason"] = {"type": "string"}
+    if mode != "explain":
+        props["total_score"] = {"type": "integer"}
+    if mode != "scores":
+        props.update({
+            "rationale": {"type": "string"},
+            "evidence": {"type": "array", "items": {"type": "string"}},
+        })
+    return {"type": "object", "properties": props,
+            "required": [f for f in ("resume_file_name", "total_score", "evidence") if f in props]}
+
+def _strict_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a JSON schema in the form strict structured outputs require:
+    every object lists all its properties as required and forbids extra keys.
+    """
+    out = dict(schema)
+    if out.get("type") == "object" and "properties" in out:
+        out["properties"] = {k: _strict_schema(v) for k, v in out["properties"].items()}
+        out["required"] = list(out["properties"])
+        out["additionalProperties"] = False
+    if out.get("type") == "array" and "items" in out:
+        out["items"] = _strict_schema(out["items"])
+    return out
+
+def _response_format(schema: Dict[str, Any], name: str = "resume_score") -> Dict[str, Any]:
+    if not SCORE_STRICT_SCHEMA:
+        return {"type": "json_object"}
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": _strict_schema(schema)}}
+
+def _coerce_score(v: Any) -> Optional[int]:
+    """Numeric score from model output (int, float or numeric string); None if not a number."""
+    if isinstance(v, bool) or v is None:
+        return None
+    if isinstance(v, (int, float)):
+        f = float(v)
+    elif isinstance(v, str):
+        try:
+            f = float(v.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    if f != f or f in (float("inf"), float("-inf")):
+        return None
+    return int(round(f))
+
+def _invalid_dimension_fields(data: Dict[str, Any], dims: List[Dict[str, Any]],
+                             scores: bool = True, reasons: bool = True) -> List[str]:
+    """Dimension score/reason fields that are missing or unusable in a model response."""
+    bad = []
+    for d in dims:
+        f_score = f"{d['id']}_{d['key']}_score"
+        f_reason = f"{d['id']}_{d['key']}_reason"
+        if scores and _coerce_score(data.get(f_score)) is None:
+            bad.append(f_score)
+        if reasons and (not isinstance(data.get(f_reason), str) or not data[f_reason].strip()):
+            bad.append(f_reason)
+    return bad
+
+def _repair_schema(schema: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    props = {f: schema["properties"][f] for f in fields if f in schema["properties"]}
+    return {"type": "object", "properties": props, "required": list(props)}
 
 def _schema_text(schema: Dict[str, Any]) -> str:
     return json.dumps(schema, separators=(",", ":"), ensure_ascii=False)
 
-def _build_prompt(jd_text: str, resume: Dict[str, Any], rubric: Dict[str, Any], schema_text: str, detected_block_text: str) -> str:
+_MODE_INSTRUCTIONS = {
+    "full": (
+        "- Score each dimension by selecting the best-fitting band; choose an integer within that band's range.\n"
+        "- Provide a short justification per dimension.\n"
+        "- Compute total_score as the sum of all dimension scores.\n"
+        "- Evidence must be 1–3 literal quotes from the resume text.\n"
+        "- If resume lacks data for a dimension, score low and state so.\n"
+    ),
+    "scores": (
+        "- Score each dimension by selecting the best-fitting band; choose an integer within that band's range.\n"
+        "- Compute total_score as the sum of all dimension scores.\n"
+        "- If resume lacks data for a dimension, score low.\n"
+        "- Return the scores only: no reasons, rationale or evidence.\n"
+    ),
+    "explain": (
+        "- The dimension scores in ASSIGNED_SCORES are final; do not change them.\n"
+        "- Provide a short justification per dimension for its assigned score, referencing resume evidence.\n"
+        "- Evidence must be 1–3 literal quotes from the resume text.\n"
+        "- If resume lacks data for a dimension, state so.\n"
+    ),
+}
+
+def _build_prompt_prefix(jd_text: str, rubric: Dict[str, Any], schema_text: str, mode: str = "full") -> str:
+    """Run-constant part of the scoring prompt: JD, rubric, instructions and schema."""
     # rubric JSON as truth source for dimensions/bands
     rubric_json = json.dumps(rubric, ensure_ascii=False)
 
     return (
         f"JOB DESCRIPTION:\n{jd_text}\n\n"
         f"PARSED_RUBRIC_JSON:\n{rubric_json}\n\n"
-        f"RESUME ({resume.get('filename')}):\n{detected_block_text}\n\n"
         "Instructions:\n"
         "- Use ONLY the resume text and DETECTED_CONTACTS for evidence.\n"
-        "- Score each dimension by selecting the best-fitting band; choose an integer within that band's range.\n"
-        "- Provide a short justification per dimension.\n"
-        "- Compute total_score as the sum of all dimension scores.\n"
-        "- Evidence must be 1–3 literal quotes from the resume text.\n"
-        "- If resume lacks data for a dimension, score low and state so.\n\n"
+        f"{_MODE_INSTRUCTIONS[mode]}\n"
         "Return ONLY JSON matching this schema (no extra text):\n"
         f"{schema_text}\n"
         "Hard requirements:\n"
-        '- "resume_file_name" must equal the provided file name exactly.\n'
-        '- "education_level" must be one of ["UG","PG","PhD"] or null.\n'
-        "- Numeric fields must be numbers (not strings).\n"
-        "- Evidence must be literal quotes from the resume.\n"
+        + ('- "resume_file_name" must equal the provided file name exactly.\n' if '"resume_file_name"' in schema_text else "")
+        + ('- "education_level" must be one of ["UG","PG","PhD"] or null.\n' if '"education_level"' in schema_text else "")
+        + "- Numeric fields must be numbers (not strings).\n"
+        + ("- Evidence must be literal quotes from the resume.\n" if mode != "scores" else "")
+        + "\n"
     )
 
-def score_with_llm(resume: Dict[str, Any], jd_text: str) -> Dict[str, Any]:
+def _completion_tokens(resp) -> int:
+    usage = getattr(resp, "usage", None)
+    return int(getattr(usage, "completion_tokens", 0) or 0)
+
+def _error_result(resume: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+    return {
+        "resume_file_name": resume.get("filename"),
+        "applicant_name": None,
+        "email": None,
+        "phone": None,
+        "city_location": None,
+        "college": None,
+        "education_level": None,
+        "graduation_year": None,
+        "total_experience_years": None,
+        "relevant_experience_years": None,
+        "current_or_last_company": None,
+        "key_roles": [],
+        "portfolio_github_links": [],
+        "linkedin_link": None,
+        "achievements": [],
+        "rationale": f"Error during scoring: {e}",
+        "evidence": [],
+        "total_score": 0,
+        "scoring_status": "error",
+    }
+
+class ScoringSession:
     """
-    Returns LLM extraction + rubric-driven scores.
+    Scoring state compiled once per run from (JD, parsed rubric, model):
+    schema, response format, prompt prefix and per-dimension clamp table.
+    `score(resume)` then only does resume-specific work.
+
+    With `local_profile`, profile fields resolved by src.profile_extract are
+    dropped from the schema the LLM has to fill; one schema/prompt variant is
+    compiled (and cached) per distinct set of resolved fields.
+
+    Two-pass scoring: `score(resume, explain=False)` asks only for numeric
+    scores under a small max_tokens cap; `explain(result, resume)` later adds
+    reasons, rationale, evidence and the remaining profile fields.
+
+    Every LLM call goes through `caller` (src.hedging): per-call deadline and
+    optional hedging, with latency/hedge stats for the run.
     """
-    # 1) Parse rubric
-    rubric = parse_rubric()  # reads RUBRIC_PATH internally
-    dims = rubric.get("dimensions", [])
-
-    # 2) Build dynamic schema & prompt
-    schema = _dynamic_schema(dims)
-    schema_text = _schema_text(schema)
-
-    raw_resume_text = (resume.get("text") or "")
-    # Detect contacts on raw text
-    detected = detect_contacts(raw_resume_text)
-    # Append machine-readable hints to the resume for the model
-    enriched_text = append_detected_block(raw_resume_text, detected)
-    # Truncate after enrichment
-    rtext_bounded = enriched_text[:MAX_RESUME_CHARS]
-
-    user_prompt = _build_prompt(
-        jd_text=jd_text,
-        resume=resume,
-        rubric=rubric,
-        schema_text=schema_text,
-        detected_block_text=rtext_bounded,
-    )
 
-    # 3) LLM call
-    try:
-        resp = _client.chat.completions.create(
-            model=OPENAI_MODEL_SCORE,
-            temperature=0,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT_SCORE},
-                {"role": "user", "content": user_prompt},
-            ],
+    def __init__(self, jd_text: str, rubric: Dict[str, Any], model: Optional[str] = None,
+                 local_profile: bool = SCORE_LOCAL_PROFILE, caller: Optional[HedgedCaller] = None):
+        self.jd_text = jd_text
+        self.rubric = rubric
+        self.model = model or OPENAI_MODEL_SCORE
+        self.dims = rubric.get("dimensions", [])
+        self.local_profile = local_profile
+        self.caller = caller or HedgedCaller()
+        self.pass1_max_tokens = SCORE_PASS1_MAX_TOKENS or 64 + 16 * len(self.dims)
+
+        self.schema = _dynamic_schema(self.dims)
+        self.schema_text = _schema_text(self.schema)
+        self.response_format = _response_format(self.schema)
+        self.prompt_prefix = _build_prompt_prefix(jd_text, rubric, self.schema_text)
+        # (score field, max points) per dimension
+        self.clamp_table = [(f"{d['id']}_{d['key']}_score", int(d["max_points"])) for d in self.dims]
+        self._repair_formats: Dict[tuple, tuple] = {}
+        self._variants: "OrderedDict[tuple, tuple]" = OrderedDict({
+            ("full", frozenset()): (self.schema, self.response_format, self.prompt_prefix),
+        })
+        self._variants_lock = threading.Lock()
+
+    def _variant(self, resolved: Iterable[str], mode: str = "full"):
+        """(schema, response_format, prompt_prefix) for `mode` without the locally resolved fields."""
+        # The scores-only schema has no profile fields, so every resume shares one variant
+        key = (mode, frozenset() if mode == "scores" else frozenset(resolved))
+        with self._variants_lock:
+            if key in self._variants:
+                self._variants.move_to_end(key)
+                return self._variants[key]
+        schema = _dynamic_schema(self.dims, omit=key[1], mode=mode)
+        variant = (
+            schema,
+            _response_format(schema),
+            _build_prompt_prefix(self.jd_text, self.rubric, _schema_text(schema), mode),
         )
-        data = json.loads(resp.choices[0].message.content)
-
-        # Defensive fills
-        if not data.get("resume_file_name"):
-            data["resume_file_name"] = resume.get("filename")
-        data.setdefault("key_roles", [])
-        data.setdefault("portfolio_github_links", [])
-        data.setdefault("achievements", [])
-        data.setdefault("evidence", [])
-
-        # Clamp per-dimension scores and recompute total
-        total = 0
-        for d in dims:
-            letter, key, max_pts = d["id"], d["key"], int(d["max_points"])
-            f = f"{letter}_{key}_score"
-            v = data.get(f)
-            val = int(v) if isinstance(v, (int, float, str)) and str(v).isdigit() else int(v) if isinstance(v, int) else 0
-            if val < 0:
-                val = 0
-            if val > max_pts:
-                val = max_pts
-            data[f] = val
-            total += val
-        data["total_score"] = int(total)
-
-        # Post-process canonical contacts using detection hints
-        data = postprocess_extracted(data, detected)
-
-    except Exception as e:
-        data = {
-            "resume_file_name": resume.get("filename"),
-            "applicant_name": None,
-            "email": None,
-            "phone": None,
-            "city_location": None,
-            "college": None,
-            "education_level": None,
-            "graduation_year": None,
-            "total_experience_years": None,
-            "relevant_experience_years": None,
-            "current_or_last_company": None,
-            "key_roles": [],
-            "portfolio_github_links": [],
-            "linkedin_link": None,
-            "achievements": [],
-            "rationale": f"Error during scoring: {e}",
-            "evidence": [],
-            "total_score": 0,
-        }
-
-    # 5) Add metadata
-    data.update({
-        "prefilter_score": resume.get("prefilter_score", 0.0)
-    })
-    return data
+        with self._variants_lock:
+            self._variants[key] = variant
+            while len(self._variants) > VARIANT_CACHE_SIZE:
+                self._variants.popitem(last=False)
+        return variant
+
+    def build_messages(self, resume: Dict[str, Any], mode: str = "full",
+                       assigned: Optional[Dict[str, int]] = None):
+        """
+        Resume-specific prompt assembly.
+        Returns (messages, schema, response_format, detected_contacts, local_profile_fields).
+        """
+        raw_resume_text = (resume.get("text") or "")
+        # Detect contacts on raw text
+        detected = detect_contacts(raw_resume_text)
+        profile = extract_profile(raw_resume_text, resume.get("filename"), detected) if self.local_profile else {}
+        schema, response_format, prompt_prefix = self._variant(profile, mode)
+        # Append machine-readable hints to the resume for the model, truncate after enrichment
+        rtext_bounded = append_detected_block(raw_resume_text, detected)[:MAX_RESUME_CHARS]
+
+        user_prompt = f"{prompt_prefix}RESUME ({resume.get('filename')}):\n{rtext_bounded}\n"
+        if assigned is not None:
+            user_prompt += f"\nASSIGNED_SCORES:\n{json.dumps(assigned)}\n"
+        messages = [
+            {"role": "system", "content": _SYSTEM_PROMPT_SCORE},
+            {"role": "user", "content": user_prompt},
+        ]
+        return messages, schema, response_format, detected, profile
+
+    def _repair_format(self, invalid: List[str]):
+        key = tuple(invalid)
+        if key not in self._repair_formats:
+            repair_schema = _repair_schema(self.schema, invalid)
+            self._repair_formats[key] = (
+                repair_schema,
+                _schema_text(repair_schema),
+                _response_format(repair_schema, name="resume_score_repair"),
+            )
+        return self._repair_formats[key]
+
+    def _complete(self, messages: List[Dict[str, str]], response_format: Dict[str, Any],
+                  max_tokens: Optional[int] = None):
+        """One chat completion -> (parsed JSON object or {}, raw content, completion tokens)."""
+        extra = {"max_tokens": max_tokens} if max_tokens else {}
+        resp = self.caller.call(lambda timeout: get_registry().chat(
+            model=self.model,
+            temperature=0,
+            response_format=response_format,
+            messages=messages,
+            timeout=timeout,
+            retries=False,
+            **extra,
+        ))
+        content = resp.choices[0].message.content
+        try:
+            data = json.loads(content)
+        except (json.JSONDecodeError, TypeError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return data, content, _completion_tokens(resp)
+
+    def _complete_with_repair(self, messages: List[Dict[str, str]], response_format: Dict[str, Any],
+                              scores: bool = True, reasons: bool = True, max_tokens: Optional[int] = None):
+        """
+        Completion plus targeted repair: re-ask only for dimension fields that are missing/invalid.
+        Returns (data, status "ok"/"repaired", still-invalid fields, completion tokens).
+        """
+        data, content, tokens = self._complete(messages, response_format, max_tokens)
+        status = "ok"
+        invalid = _invalid_dimension_fields(data, self.dims, scores, reasons)
+        for _ in range(SCORE_REPAIR_RETRIES):
+            if not invalid:
+                break
+            status = "repaired"
+            repair_schema, repair_text, repair_format = self._repair_format(invalid)
+            patch, _, patch_tokens = self._complete(
+                messages + [
+                    {"role": "assistant", "content": content or ""},
+                    {"role": "user", "content": (
+                        "These fields were missing or invalid: " + ", ".join(invalid) + ".\n"
+                        "Return ONLY JSON with exactly these fields, matching this schema:\n"
+                        f"{repair_text}"
+                    )},
+                ],
+                repair_format,
+                max_tokens,
+            )
+            tokens += patch_tokens
+            data.update({k: v for k, v in patch.items() if k in repair_schema["properties"]})
+            invalid = _invalid_dimension_fields(data, self.dims, scores, reasons)
+        return data, status, invalid, tokens
+
+    def score(self, resume: Dict[str, Any], explain: bool = True) -> Dict[str, Any]:
+        """
+        Returns LLM extraction + rubric-driven scores for one resume.
+        explain=False is the first pass of two-pass scoring: numeric scores only.
+        """
+        mode = "full" if explain else "scores"
+        messages, _, response_format, detected, profile = self.build_messages(resume, mode)
+        completion_tokens = 0
+
+        try:
+            data, status, invalid, completion_tokens = self._complete_with_repair(
+                messages, response_format, reasons=explain,
+                max_tokens=None if explain else self.pass1_max_tokens,
+            )
+            if invalid:
+                status = "partial"
+                data["scoring_issues"] = invalid
+
+            merge_profile(data, profile)
+
+            # Defensive fills
+            if not data.get("resume_file_name"):
+                data["resume_file_name"] = resume.get("filename")
+            data.setdefault("key_roles", [])
+            data.setdefault("portfolio_github_links", [])
+            data.setdefault("achievements", [])
+            data.setdefault("evidence", [])
+
+            # Clamp per-dimension scores and recompute total
+            total = 0
+            for f, max_pts in self.clamp_table:
+                val = _coerce_score(data.get(f))
+                if val is None:
+                    val = 0  # still invalid after repair; flagged via scoring_status="partial"
+                val = min(max(val, 0), max_pts)
+                data[f] = val
+                total += val
+            data["total_score"] = int(total)
+            data["scoring_status"] = status
+            data["explained"] = explain
+
+            # Post-process canonical contacts using detection hints
+            data = postprocess_extracted(data, detected)
+
+        except Exception as e:
+            data = _error_result(resume, e)
+
+        # Add metadata
+        data.update({
+            "prefilter_score": resume.get("prefilter_score", 0.0),
+            "completion_tokens": completion_tokens,
+        })
+        return data
+
+    def explain(self, result: Dict[str, Any], resume: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Second pass of two-pass scoring: add reasons, rationale, evidence and the
+        profile fields not resolved locally to a scores-only `result` (in place).
+        Scores are sent as ASSIGNED_SCORES and never changed, so the ranking holds.
+        """
+        assigned = {f: result.get(f) for f, _ in self.clamp_table}
+        messages, schema, response_format, detected, profile = self.build_messages(resume, "explain", assigned)
+        try:
+            patch, status, invalid, tokens = self._complete_with_repair(messages, response_format, scores=False)
+            result.update({k: v for k, v in patch.items() if k in schema["properties"]})
+            merge_profile(result, profile)
+            result["completion_tokens"] = result.get("completion_tokens", 0) + tokens
+            if invalid:
+                result["scoring_status"] = "partial"
+                result["scoring_issues"] = result.get("scoring_issues", []) + invalid
+            elif status == "repaired" and result.get("scoring_status") == "ok":
+                result["scoring_status"] = "repaired"
+            result["explained"] = True
+            postprocess_extracted(result, detected)
+        except Exception as e:
+            result["rationale"] = f"Error during explanation: {e}"
+        return result
+
+def explain_top(session: ScoringSession, ranked: List[Dict[str, Any]], resumes: List[Dict[str, Any]],
+                top_n: int, on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Run the explain pass for the top `top_n` of a ranked scores-only list.
+    Returns token accounting; est_saved_tokens = average explain cost x resumes not explained.
+    """
+    by_name = {r["filename"]: r for r in resumes}
+    pass1_tokens = sum(r.get("completion_tokens", 0) for r in ranked)
+    finalists = [r for r in ranked[:top_n] if r.get("scoring_status") != "error" and r["resume_file_name"] in by_name]
+    for i, r in enumerate(finalists, 1):
+        session.explain(r, by_name[r["resume_file_name"]])
+        if on_progress:
+            on_progress(i, len(finalists))
+    pass2_tokens = sum(r.get("completion_tokens", 0) for r in ranked) - pass1_tokens
+    skipped = len(ranked) - len(finalists)
+    return {
+        "explained": len(finalists),
+        "skipped": skipped,
+        "pass1_tokens": pass1_tokens,
+        "pass2_tokens": pass2_tokens,
+        "est_saved_tokens": round(pass2_tokens / len(finalists) * skipped) if finalists else 0,
+    }
+
+def score_with_llm(resume: Dict[str, Any], jd_text: str, rubric: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Returns LLM extraction + rubric-driven scores.
+    One-off convenience wrapper; for many resumes build a ScoringSession once instead.
+    """
+    if rubric is None:
+        rubric = parse_rubric()  # reads RUBRIC_PATH internally
+    return ScoringSession(jd_text, rubric).score(resume)
 
 # Backwards-compatible alias
 def score_resume(resume: Dict[str, Any], jd_text: str):
@@ -0,0 +1,210 @@
+# src/service.py
+"""
+Local HTTP screening service.
+
+Keeps one warm process (OpenAI clients, parsed rubrics, sklearn imports) and runs
+screening jobs from a bounded queue on a pool of worker threads.
+
+    python -m src.service --port 8765 --workers 4 --max-queue 20
+
+Endpoints:
+    POST /jobs               submit a job -> 202 {"job_id": ...}; 429 when the queue is full
+    GET  /jobs/<id>          job status / progress
+    GET  /jobs/<id>/results  ranked results once the job is done (409 before that)
+    GET  /health             liveness + queue depth
+
+Point OPENAI_BASE_URL at any OpenAI-compatible server (e.g. a local mock) to run
+the service end to end without the public API.
+"""
+import os
+import json
+import base64
+import hashlib
+import argparse
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.jobs import JobRunner, JobStore, JobQueueFull, JobContext, screening_job, JOB_WORKERS
+from src.rubric_parser import parse_rubric_text
+
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+SERVICE_MAX_QUEUE = int(os.getenv("SERVICE_MAX_QUEUE", "20"))
+SERVICE_MAX_BODY_BYTES = int(os.getenv("SERVICE_MAX_BODY_BYTES", str(200 * 1024 * 1024)))
+RUBRIC_CACHE_SIZE = 32
+
+logger = logging.getLogger(__name__)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class ScreeningService:
+    """Job submission + warm caches shared by all requests of the service."""
+
+    def __init__(self, runner: JobRunner):
+        self.runner = runner
+        self._rubrics: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._rubrics_lock = threading.Lock()
+
+    def rubric_for(self, rubric_text: str) -> Dict[str, Any]:
+        """Parse a rubric once per distinct text; failed parses are not cached."""
+        key = hashlib.sha256(rubric_text.encode("utf-8")).hexdigest()
+        with self._rubrics_lock:
+            if key in self._rubrics:
+                self._rubrics.move_to_end(key)
+                return self._rubrics[key]
+        rubric = parse_rubric_text(rubric_text)
+        if not rubric.get("error"):
+            with self._rubrics_lock:
+                self._rubrics[key] = rubric
+                while len(self._rubrics) > RUBRIC_CACHE_SIZE:
+                    self._rubrics.popitem(last=False)
+        return rubric
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        """
+        payload: {"jd_text": str, "rubric_text": str, "top_k": int (default 100), "model": str (optional),
+                  "explain_top": int (optional; two-pass scoring, reasons only for the top N),
+                  "resumes": [{"filename": str, "text": str} | {"filename": str, "content_base64": str}]}
+        """
+        jd_text = payload.get("jd_text")
+        rubric_text = payload.get("rubric_text")
+        if not isinstance(jd_text, str) or not jd_text.strip():
+            raise BadRequest("jd_text is required")
+        if not isinstance(rubric_text, str) or not rubric_text.strip():
+            raise BadRequest("rubric_text is required")
+        try:
+            top_k = int(payload.get("top_k", 100))
+        except (TypeError, ValueError):
+            raise BadRequest("top_k must be an integer")
+        if top_k < 1:
+            raise BadRequest("top_k must be at least 1")
+
+        model = payload.get("model")
+        if model is not None and not isinstance(model, str):
+            raise BadRequest("model must be a string")
+        explain_top = payload.get("explain_top")
+        if explain_top is not None and (isinstance(explain_top, bool) or not isinstance(explain_top, int)):
+            raise BadRequest("explain_top must be an integer")
+        if explain_top is not None and explain_top < 0:
+            raise BadRequest("explain_top must not be negative")
+        files, resumes = self._read_resumes(payload.get("resumes"))
+
+        def run(ctx: JobContext) -> List[Dict[str, Any]]:
+            rubric = self.rubric_for(rubric_text)
+            return screening_job(files, jd_text, rubric_text, top_k, resumes=resumes, rubric=rubric, model=model,
+                                 explain_top=explain_top)(ctx)
+
+        return self.runner.submit(run, params={"resumes": len(files) + len(resumes), "top_k": top_k, "model": model})
+
+    @staticmethod
+    def _read_resumes(items: Any) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, Any]]]:
+        if not isinstance(items, list) or not items:
+            raise BadRequest("resumes must be a non-empty list")
+        files, resumes = [], []
+        for item in items:
+            if not isinstance(item, dict) or not item.get("filename"):
+                raise BadRequest("each resume needs a filename")
+            name = os.path.basename(str(item["filename"]))
+            if "content_base64" in item:
+                try:
+                    files.append((name, base64.b64decode(item["content_base64"], validate=True)))
+                except (ValueError, TypeError):
+                    raise BadRequest(f"invalid base64 content for {name}")
+            elif isinstance(item.get("text"), str):
+                resumes.append({"filename": name, "path": None, "text": item["text"]})
+            else:
+                raise BadRequest(f"resume {name} needs text or content_base64")
+        return files, resumes
+
+
+def make_handler(service: ScreeningService):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "ResumeScreener/0.1"
+
+        def _send(self, status: int, body: Dict[str, Any] | List[Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _parts(self) -> List[str]:
+            return [p for p in self.path.split("?", 1)[0].split("/") if p]
+
+        def do_GET(self):
+            parts = self._parts()
+            if parts == ["health"]:
+                return self._send(200, {"status": "ok", "pending_jobs": service.runner.pending()})
+            if len(parts) in (2, 3) and parts[0] == "jobs":
+                state = service.runner.get(parts[1])
+                if state is None:
+                    return self._send(404, {"error": "job not found"})
+                if len(parts) == 2:
+                    return self._send(200, state)
+                if parts[2] == "results":
+                    if state.get("status") != "done":
+                        return self._send(409, {"error": "job not finished", "status": state.get("status")})
+                    return self._send(200, service.runner.results(parts[1]) or [])
+            self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self._parts() != ["jobs"]:
+                return self._send(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                return self._send(400, {"error": "invalid Content-Length"})
+            if length <= 0 or length > SERVICE_MAX_BODY_BYTES:
+                return self._send(413 if length > 0 else 400, {"error": "missing or oversized body"})
+            try:
+                payload = json.loads(self.rfile.read(length))
+                job_id = service.submit(payload if isinstance(payload, dict) else {})
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return self._send(400, {"error": "body must be JSON"})
+            except BadRequest as e:
+                return self._send(400, {"error": str(e)})
+            except JobQueueFull as e:
+                return self._send(429, {"error": str(e)})
+            self._send(202, {"job_id": job_id, "status_url": f"/jobs/{job_id}"})
+
+        def log_message(self, fmt, *args):
+            logger.info("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def make_server(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = JOB_WORKERS,
+                max_queue: int = SERVICE_MAX_QUEUE, jobs_dir: Optional[str] = None) -> ThreadingHTTPServer:
+    runner = JobRunner(JobStore(jobs_dir) if jobs_dir else JobStore(), workers=workers, max_queue=max_queue)
+    return ThreadingHTTPServer((host, port), make_handler(ScreeningService(runner)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Resume Screener HTTP service")
+    ap.add_argument("--host", default=SERVICE_HOST)
+    ap.add_argument("--port", type=int, default=SERVICE_PORT)
+    ap.add_argument("--workers", type=int, default=JOB_WORKERS, help="Concurrent screening jobs")
+    ap.add_argument("--max-queue", type=int, default=SERVICE_MAX_QUEUE, help="Max jobs waiting for a worker")
+    ap.add_argument("--jobs-dir", default=None, help="Where job state/results are stored (default: JOBS_DIR)")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_server(args.host, args.port, args.workers, args.max_queue, args.jobs_dir)
+    print(f"Resume Screener service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
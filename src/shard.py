@@ -0,0 +1,122 @@
+# src/shard.py
+"""
+Sharded runs: split a resume pool across processes/machines and merge the results.
+
+Workflow (N shards, global shortlist of K):
+    1. each shard:  python -m src.cli --resumes R --jd J --shard i/N --prefilter-only --k K --out s_i
+    2. once:        python -m src.cli merge --shortlists --k K --shards s_0 ... s_N-1 --out global
+    3. each shard:  python -m src.cli --resumes R --jd J --shard i/N --shortlist global/shortlist.jsonl --out s_i
+    4. once:        python -m src.cli merge --shards s_0 ... s_N-1 --out global
+
+A shard's top-K always contains every resume of that shard that can be in the global
+top-K, so step 2 only needs K (filename, score) rows per shard, never the resume text.
+Prefilter scores use each shard's own TF-IDF statistics; with hash partitioning the
+shards see statistically similar pools, so scores are comparable across shards.
+"""
+import os
+import csv
+import json
+import heapq
+import hashlib
+from typing import Dict, Any, List, Iterator, Tuple, Callable
+
+from src.ranker import ranking_key
+
+SHORTLIST_FILE = "shortlist.jsonl"
+DETAILS_FILE = "details.jsonl"
+RESULTS_FILE = "results.csv"
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """'i/N' -> (i, N) with 0 <= i < N."""
+    try:
+        i, n = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise ValueError(f"Invalid shard spec {spec!r}, expected i/N (e.g. 0/4)")
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"Invalid shard spec {spec!r}: need 0 <= i < N")
+    return i, n
+
+
+def _stable_hash(data: bytes) -> int:
+    # sha1 rather than hash(): identical on every machine and Python process
+    return int.from_bytes(hashlib.sha1(data).digest()[:8], "big")
+
+
+def shard_of(path: str, num_shards: int, by: str = "name") -> int:
+    """Shard index for a file, by file name (default) or by file content."""
+    if by == "content":
+        with open(path, "rb") as f:
+            return _stable_hash(f.read()) % num_shards
+    return _stable_hash(os.path.basename(path).encode("utf-8")) % num_shards
+
+
+def shard_filter(shard: int, num_shards: int, by: str = "name") -> Callable[[str], bool]:
+    return lambda path: shard_of(path, num_shards, by) == shard
+
+
+def write_shortlist(out_dir: str, shortlisted: List[Dict[str, Any]], shard: int) -> str:
+    path = os.path.join(out_dir, SHORTLIST_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        for r in shortlisted:
+            f.write(json.dumps({"filename": r["filename"], "prefilter_score": r["prefilter_score"], "shard": shard}) + "\n")
+    return path
+
+
+def read_shortlist(path: str) -> Dict[str, float]:
+    """filename -> prefilter_score"""
+    out = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                out[row["filename"]] = float(row["prefilter_score"])
+    return out
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def merge_shortlists(shard_dirs: List[str], out_dir: str, top_k: int) -> str:
+    """Global top-k from per-shard top-k lists (score desc, file name asc on ties)."""
+    rows = []
+    for d in shard_dirs:
+        rows.extend(_iter_jsonl(os.path.join(d, SHORTLIST_FILE)))
+    best = heapq.nsmallest(top_k, rows, key=lambda r: (-float(r["prefilter_score"]), r["filename"]))
+    path = os.path.join(out_dir, SHORTLIST_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        for r in best:
+            f.write(json.dumps(r) + "\n")
+    return path
+
+
+def merge_rankings(shard_dirs: List[str], out_dir: str) -> int:
+    """
+    k-way merge of per-shard ranked details.jsonl into one global ranking.
+    Uses the same ordering as aggregate_and_rank, so the result equals ranking
+    all shards' results together. Streams rows; returns the number merged.
+    """
+    paths = [os.path.join(d, DETAILS_FILE) for d in shard_dirs]
+
+    # Pass 1: CSV header = union of keys in first-seen order (like pd.DataFrame(records))
+    columns: Dict[str, None] = {}
+    for p in paths:
+        for r in _iter_jsonl(p):
+            columns.update(dict.fromkeys(r))
+    columns.update(dict.fromkeys(["final_score", "rank"]))
+
+    # Pass 2: merge the already-sorted shard streams
+    count = 0
+    with open(os.path.join(out_dir, DETAILS_FILE), "w", encoding="utf-8") as jf, \
+            open(os.path.join(out_dir, RESULTS_FILE), "w", encoding="utf-8", newline="") as cf:
+        writer = csv.DictWriter(cf, fieldnames=list(columns))
+        writer.writeheader()
+        for count, r in enumerate(heapq.merge(*(_iter_jsonl(p) for p in paths), key=ranking_key), 1):
+            r["rank"] = count
+            jf.write(json.dumps(r, ensure_ascii=False) + "\n")
+            writer.writerow(r)
+    return count
@@ -1 +1,28 @@
-# Utilities module - currently empty after removing caching functionality
+# src/utils.py
+import os
+import tempfile
+
+# Recent-latency samples kept for percentiles (hedging, per-backend stats)
+LATENCY_WINDOW = 500
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample (pct in 0..100)."""
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def write_text_atomic(path: str, text: str) -> None:
+    """Write via a unique temp file in the same directory + rename, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
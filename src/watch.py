@@ -0,0 +1,193 @@
+# src/watch.py
+"""
+Watch-folder mode: keep a live ranking for a folder that keeps receiving resumes.
+
+Only new or changed files are parsed and prefilter-scored. A file is LLM-scored when
+its prefilter score clears the current shortlist threshold (the k-th best prefilter
+score seen so far), and its result is inserted into the existing ranking.
+results.csv / details.jsonl are republished atomically after every change.
+"""
+import os
+import json
+import time
+import bisect
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+from src.parser import parse_resume_file, is_supported, PARSE_MAX_CHARS, PARSE_MAX_PAGES
+from src.parse_pool import ParsePool
+from src.prefilter import PrefilterModel
+from src.scorer import ScoringSession
+from src.ranker import aggregate_and_rank, insert_ranked, remove_ranked
+from src.utils import write_text_atomic
+
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "5"))
+# Files modified more recently than this are assumed to still be copying in
+WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "2"))
+
+logger = logging.getLogger(__name__)
+
+
+def publish_results(out_dir: str, ranked: List[Dict[str, Any]]) -> None:
+    """Write details.jsonl + results.csv via temp file + rename so readers never see partial files."""
+    details = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in ranked)
+    write_text_atomic(os.path.join(out_dir, "details.jsonl"), details)
+    write_text_atomic(os.path.join(out_dir, "results.csv"), pd.DataFrame(ranked).to_csv(index=False))
+
+
+class ResumeWatcher:
+    """
+    Pass a ParsePool to parse in isolated, time-limited workers, so a malformed
+    file dropped into the folder gets an error result instead of stalling the
+    watcher. Without one, files are parsed in-process.
+    """
+
+    def __init__(self, folder: str, session: ScoringSession, out_dir: str, top_k: int = 100,
+                 pool: Optional[ParsePool] = None,
+                 max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES):
+        self.folder = folder
+        self.session = session
+        self.jd_text = session.jd_text
+        self.out_dir = out_dir
+        self.top_k = top_k
+        self.pool = pool
+        self.max_chars = max_chars
+        self.max_pages = max_pages
+
+        self.model = None
+        self.signatures: Dict[str, Tuple[int, int]] = {}   # filename -> (mtime_ns, size)
+        self.prefilter: Dict[str, float] = {}               # filename -> prefilter score
+        self.sorted_prefilter: List[float] = []             # ascending, for the k-th best threshold
+        self.scored: Dict[str, Dict[str, Any]] = {}         # filename -> result in self.ranked
+        self.ranked: List[Dict[str, Any]] = []
+
+    # --- shortlist threshold -------------------------------------------------
+
+    def threshold(self) -> float:
+        """Prefilter score a resume must reach to enter the current top-k shortlist."""
+        if len(self.sorted_prefilter) < self.top_k:
+            return float("-inf")
+        return self.sorted_prefilter[-self.top_k]
+
+    def _set_prefilter(self, filename: str, score: float) -> None:
+        self._drop_prefilter(filename)
+        self.prefilter[filename] = score
+        bisect.insort(self.sorted_prefilter, score)
+
+    def _drop_prefilter(self, filename: str) -> None:
+        old = self.prefilter.pop(filename, None)
+        if old is not None:
+            del self.sorted_prefilter[bisect.bisect_left(self.sorted_prefilter, old)]
+
+    def _drop_scored(self, filename: str) -> None:
+        old = self.scored.pop(filename, None)
+        if old is not None:
+            remove_ranked(self.ranked, old)
+
+    # --- folder scanning -----------------------------------------------------
+
+    def _parse(self, filenames: List[str]) -> List[str]:
+        """Texts for `filenames` (in order), via the parse pool when there is one."""
+        items = [(f, os.path.join(self.folder, f)) for f in filenames]
+        if self.pool is not None:
+            return [text for text, _ in self.pool.parse_many(items)]
+        return [parse_resume_file(path, self.max_chars, self.max_pages) for _, path in items]
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        now = time.time()
+        found = {}
+        for entry in os.scandir(self.folder):
+            if not entry.is_file() or not is_supported(entry.name):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                # Moved or deleted since the listing; it will be picked up (or dropped) next poll
+                continue
+            if now - st.st_mtime < WATCH_SETTLE_SECONDS:
+                continue
+            found[entry.name] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def initial_run(self) -> None:
+        """Batch-process what is already in the folder, exactly like a one-shot CLI run."""
+        self.signatures = self._scan()
+        filenames = sorted(self.signatures)
+        resumes = [
+            {"filename": f, "path": os.path.join(self.folder, f), "text": text}
+            for f, text in zip(filenames, self._parse(filenames))
+        ]
+        self.model = PrefilterModel(self.jd_text, [r["text"] for r in resumes])
+        for r, score in zip(resumes, self.model.corpus_scores):
+            r["prefilter_score"] = float(score)
+            self._set_prefilter(r["filename"], float(score))
+
+        shortlisted = sorted(resumes, key=lambda x: x["prefilter_score"], reverse=True)[:self.top_k]
+        results = []
+        for r in shortlisted:
+            scored = self.session.score(r)
+            self.scored[r["filename"]] = scored
+            results.append(scored)
+        self.ranked = aggregate_and_rank(results)
+        publish_results(self.out_dir, self.ranked)
+        logger.info("Initial run: %d resumes, %d scored", len(resumes), len(results))
+
+    def poll(self) -> int:
+        """Process new/changed/deleted files once; returns number of files handled."""
+        current = self._scan()
+        changed = [f for f, sig in current.items() if self.signatures.get(f) != sig]
+        # files still settling are missing from `current` but not deleted
+        deleted = [f for f in self.signatures if f not in current and not os.path.exists(os.path.join(self.folder, f))]
+
+        for f in deleted:
+            self.signatures.pop(f, None)
+            self._drop_prefilter(f)
+            self._drop_scored(f)
+            logger.info("Removed: %s", f)
+
+        if changed:
+            changed.sort()
+            texts = self._parse(changed)
+            scores = self.model.score(texts)
+            for f, text, score in zip(changed, texts, scores):
+                self.signatures[f] = current[f]
+                self._drop_scored(f)
+                score = float(score)
+                admitted = score >= self.threshold()
+                self._set_prefilter(f, score)
+                if not admitted:
+                    logger.info("Below shortlist threshold: %s (%.4f)", f, score)
+                    continue
+                resume = {"filename": f, "path": os.path.join(self.folder, f), "text": text, "prefilter_score": score}
+                scored = self.session.score(resume)
+                self.scored[f] = scored
+                insert_ranked(self.ranked, scored)
+                logger.info("Scored: %s -> rank %s", f, scored.get("rank"))
+
+        if changed or deleted:
+            publish_results(self.out_dir, self.ranked)
+        return len(changed) + len(deleted)
+
+
+def watch_folder(folder: str, session: ScoringSession, out_dir: str,
+                 top_k: int = 100, interval: float = WATCH_INTERVAL, pool: Optional[ParsePool] = None,
+                 max_chars: int = PARSE_MAX_CHARS, max_pages: int = PARSE_MAX_PAGES) -> None:
+    """Run the initial batch, then poll `folder` every `interval` seconds until interrupted."""
+    watcher = ResumeWatcher(folder, session, out_dir, top_k, pool, max_chars, max_pages)
+    watcher.initial_run()
+    print(f"Watching {folder} (every {interval:g}s). Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                handled = watcher.poll()
+            except Exception:
+                # e.g. the folder is briefly unavailable; keep the daemon alive and retry next interval
+                logger.exception("Watch poll failed; retrying in %gs", interval)
+                continue
+            if handled:
+                print(f"Updated ranking: {len(watcher.ranked)} scored, {handled} file(s) changed")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
@@ -0,0 +1,109 @@
+import socket
+
+import openai
+import pytest
+
+from benchmarks.bench_backends import start_stub
+from src.backends import Backend, BackendRegistry, BACKEND_FAILURES_BEFORE_COOLDOWN
+from src.hedging import HedgedCaller
+
+# Weight that routes a backend last: random() ** (1 / weight) is ~0
+LAST = 1e-9
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def start(failure_rate=0.0, failure_status=503):
+        server = start_stub(f"stub{len(servers)}", 0.0, failure_rate, failure_status=failure_status)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/v1"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def _closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def _registry(*backends):
+    return BackendRegistry.from_config([
+        {"name": name, "base_url": url, "api_key": "stub", "weight": weight} for name, url, weight in backends
+    ])
+
+
+def _chat(registry):
+    return registry.chat(model="stub", messages=[{"role": "user", "content": "hi"}])
+
+
+def test_calls_are_split_by_weight(stubs):
+    registry = _registry(("heavy", stubs(), 3), ("light", stubs(), 1))
+    for _ in range(400):
+        _chat(registry)
+    stats = registry.stats()
+    assert stats["heavy"]["calls"] + stats["light"]["calls"] == 400
+    assert 0.65 < stats["heavy"]["calls"] / 400 < 0.85
+    assert stats["heavy"]["errors"] == stats["light"]["errors"] == 0
+
+
+@pytest.mark.parametrize("bad_url", ["5xx", "connection"])
+def test_fails_over_and_cools_down(stubs, bad_url):
+    url = stubs(failure_rate=1.0) if bad_url == "5xx" else _closed_port_url()
+    registry = _registry(("bad", url, 1), ("good", stubs(), LAST))
+    bad, good = registry.backends
+
+    for _ in range(BACKEND_FAILURES_BEFORE_COOLDOWN):
+        _chat(registry)
+    assert good.stats()["calls"] == BACKEND_FAILURES_BEFORE_COOLDOWN
+    assert bad.stats()["errors"] == BACKEND_FAILURES_BEFORE_COOLDOWN
+    assert not bad.available()
+    assert bad.stats()["cooling_down"]
+
+    # While cooling down the bad backend is tried last, so the next call goes straight to the good one
+    _chat(registry)
+    assert bad.stats()["calls"] == BACKEND_FAILURES_BEFORE_COOLDOWN
+    assert good.stats()["calls"] == BACKEND_FAILURES_BEFORE_COOLDOWN + 1
+
+
+def test_client_error_does_not_fail_over(stubs):
+    registry = _registry(("bad", stubs(failure_rate=1.0, failure_status=400), 1), ("good", stubs(), LAST))
+    bad, good = registry.backends
+    with pytest.raises(openai.BadRequestError):
+        _chat(registry)
+    assert bad.stats()["errors"] == 1
+    assert good.stats()["calls"] == 0
+
+
+def test_all_backends_failing_raises_last_error(stubs):
+    registry = _registry(("a", stubs(failure_rate=1.0), 1), ("b", stubs(failure_rate=1.0), 1))
+    with pytest.raises(openai.InternalServerError):
+        _chat(registry)
+    assert [b.stats()["errors"] for b in registry.backends] == [1, 1]
+
+
+def test_stats_counts_and_percentiles():
+    backend = Backend("b", api_key="stub")
+    caller = HedgedCaller()
+    for ms in range(1, 101):
+        backend.record(ms / 1000, ok=True)
+        caller._record(ms / 1000)
+    backend.record(5.0, ok=False)  # failures count as calls but not as latency samples
+
+    stats = backend.stats()
+    assert (stats["calls"], stats["errors"], stats["cooling_down"]) == (101, 1, False)
+    assert (stats["p50_seconds"], stats["p95_seconds"]) == (0.051, 0.095)
+    # Same samples, same percentiles as the hedging stats
+    assert caller.stats()["p50_seconds"] == stats["p50_seconds"]
+    assert caller.stats()["p95_seconds"] == stats["p95_seconds"]
+
+
+def test_stats_empty_backend():
+    stats = Backend("b", api_key="stub").stats()
+    assert stats["calls"] == 0
+    assert stats["p50_seconds"] is None and stats["p95_seconds"] is None
@@ -0,0 +1,117 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import hedging
+from src.hedging import CallTimeout, HedgedCaller
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Replace the shared call pool with one of a given size."""
+    pools = []
+
+    def make(size):
+        pools.append(ThreadPoolExecutor(max_workers=size))
+        monkeypatch.setattr(hedging, "_pool", pools[-1])
+
+    make(8)
+    yield make
+    for p in pools:
+        p.shutdown(wait=False, cancel_futures=True)
+
+
+class FakeCreate:
+    """Stands in for a chat completion: the n-th call sleeps delays[n] (default 0) and returns n."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.timeouts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, timeout):
+        with self._lock:
+            n = len(self.timeouts)
+            self.timeouts.append(timeout)
+        time.sleep(self.delays[n] if n < len(self.delays) else 0)
+        return n
+
+
+def _warm_up(caller, n):
+    for _ in range(n):
+        caller.call(FakeCreate())
+
+
+def test_deadline(pool):
+    caller = HedgedCaller(timeout=0.2)
+    create = FakeCreate(1.0)
+    t0 = time.monotonic()
+    with pytest.raises(CallTimeout):
+        caller.call(create)
+    assert time.monotonic() - t0 < 0.5
+    assert create.timeouts == [0.2]
+    assert caller.stats()["timeouts"] == 1
+
+
+def test_deadline_starts_when_the_call_runs(pool):
+    pool(1)
+    blocker = hedging._get_pool().submit(time.sleep, 0.3)
+    caller = HedgedCaller(timeout=0.2)
+    # Queued behind the blocker for longer than the deadline, yet still sent with the full timeout
+    assert caller.call(FakeCreate(0.05)) == 0
+    assert blocker.done()
+    assert caller.stats()["timeouts"] == 0
+
+
+def test_hedge_fires_and_wins(pool):
+    caller = HedgedCaller(timeout=2.0, hedge=True, min_samples=3, max_rate=1.0)
+    _warm_up(caller, 3)
+    create = FakeCreate(1.0, 0.0)
+    t0 = time.monotonic()
+    assert caller.call(create) == 1  # the hedge's answer
+    assert time.monotonic() - t0 < 0.5
+    assert create.timeouts[0] == 2.0 and create.timeouts[1] < 2.0  # the hedge gets what is left
+    stats = caller.stats()
+    assert (stats["calls"], stats["hedges"], stats["hedges_won"], stats["timeouts"]) == (4, 1, 1, 0)
+
+
+def test_no_hedge_while_warming_up_or_disabled(pool):
+    for caller in (HedgedCaller(hedge=True, min_samples=3, max_rate=1.0), HedgedCaller(hedge=False, min_samples=0)):
+        create = FakeCreate(0.1)
+        assert caller.call(create) == 0
+        assert len(create.timeouts) == 1
+        assert caller.stats()["hedges"] == 0
+
+
+def test_hedge_rate_cap(pool):
+    caller = HedgedCaller(timeout=2.0, hedge=True, min_samples=9, max_rate=0.1)
+    _warm_up(caller, 9)
+    assert caller.call(FakeCreate(0.3, 0.0)) == 1   # 10th call: 1 hedge <= 10% of 10 calls
+    assert caller.call(FakeCreate(0.3, 0.0)) == 0   # 11th call: a 2nd hedge would exceed the cap
+    stats = caller.stats()
+    assert (stats["calls"], stats["hedges"], stats["hedges_won"]) == (11, 1, 1)
+
+
+def test_queued_hedge_is_not_counted(pool):
+    pool(1)
+    caller = HedgedCaller(timeout=2.0, hedge=True, min_samples=3, max_rate=1.0)
+    _warm_up(caller, 3)
+    create = FakeCreate(0.2)
+    # The only pool thread is busy with the primary, so the hedge never gets to run
+    assert caller.call(create) == 0
+    assert len(create.timeouts) == 1
+    stats = caller.stats()
+    assert (stats["hedges"], stats["hedges_won"]) == (0, 0)
+
+
+def test_errors_propagate(pool):
+    caller = HedgedCaller(timeout=1.0)
+
+    def fail(timeout):
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        caller.call(fail)
+    assert caller.stats()["timeouts"] == 0
@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+from src.profile_extract import extract_profile, extract_roles, merge_profile
+
+TODAY = date(2025, 6, 1)
+
+
+def _roles(text):
+    return [(r["title"], r["company"], r["start_month"], r["start_year"], r["end_month"], r["end_year"])
+            for r in extract_roles(text, TODAY)]
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Software Engineer | Acme | Jan 2019 - Present", ("Software Engineer", "Acme", 1, 2019, 6, 2025)),
+    ("Engineer at Foo, Sept. 2018 to March 2020", ("Engineer", "Foo", 9, 2018, 3, 2020)),
+    ("Intern, Bar Labs, 06/2017 - 12/2017", ("Intern", "Bar Labs", 6, 2017, 12, 2017)),
+    ("Analyst, Mayfair Capital, May 2016 - December 2017", ("Analyst", "Mayfair Capital", 5, 2016, 12, 2017)),
+])
+def test_extract_roles_parses_title_company_and_dates(line, expected):
+    assert _roles(line) == [expected]
+
+
+def test_company_name_is_not_read_as_a_month():
+    assert _roles("Software Engineer, Novartis, 2019 – 2021") == [
+        ("Software Engineer", "Novartis", None, 2019, None, 2021)
+    ]
+
+
+def test_ordinary_words_are_not_read_as_months():
+    assert _roles("Digital Marketing 2019 - 2021") == [(None, None, None, 2019, None, 2021)]
+
+
+def test_section_heading_is_not_a_company():
+    assert _roles("Data Analyst | Summary 2018 - 2020") == [(None, None, None, 2018, None, 2020)]
+
+
+def test_roles_are_most_recent_first():
+    text = "Developer | Old Co | 2015 - 2017\nSoftware Engineer | New Co | Mar 2018 - Present"
+    assert [r[1] for r in _roles(text)] == ["New Co", "Old Co"]
+
+
+def test_profile_work_history_and_overlap_counted_once():
+    text = ("Jane Doe\njane@example.com\n\nEXPERIENCE\n"
+            "Software Engineer | New Co | Jan 2020 - Dec 2021\n"
+            "Consultant | Side Co | Jan 2021 - Dec 2021\n")
+    profile = extract_profile(text, "jane.txt", today=TODAY)
+    assert profile["current_or_last_company"] == "New Co"
+    assert profile["total_experience_years"] == 2.0
+    assert len(profile["key_roles"]) == 2
+
+
+def test_profile_skips_work_history_when_any_role_is_unattributed():
+    text = "Jane Doe\n\nEXPERIENCE\nSoftware Engineer | Acme | 2019 - 2021\nDigital Marketing 2017 - 2019\n"
+    profile = extract_profile(text, today=TODAY)
+    assert "key_roles" not in profile
+    assert "current_or_last_company" not in profile
+
+
+@pytest.mark.parametrize("header, name", [
+    ("Jane Doe\njane@example.com", "Jane Doe"),
+    ("JOHN SMITH\nSenior Data Scientist", "John Smith"),
+    ("Ana de la Cruz\nMadrid", "Ana de la Cruz"),
+    ("python rag langchain\nJohn Smith", "John Smith"),
+    ("Professional Summary\nJane Doe", "Jane Doe"),
+])
+def test_applicant_name(header, name):
+    assert extract_profile(header, today=TODAY).get("applicant_name") == name
+
+
+@pytest.mark.parametrize("header", [
+    "Senior Data Scientist\njane@example.com",
+    "python rag langchain\njane@example.com",
+    "Product Owner\njane@example.com",
+    "Curriculum Vitae\njane@example.com",
+])
+def test_no_applicant_name_when_unsure(header):
+    assert "applicant_name" not in extract_profile(header, today=TODAY)
+
+
+def test_education_fields():
+    text = "Jane Doe\n\nEDUCATION\nB.Tech, XYZ Institute of Technology, 2015 - 2019\n"
+    profile = extract_profile(text, today=TODAY)
+    assert profile["education_level"] == "UG"
+    assert profile["graduation_year"] == 2019
+    assert profile["college"] == "XYZ Institute of Technology"
+
+
+def test_portfolio_links_only_from_portfolio_hosts():
+    text = ("Jane Doe\njane@example.com | github.com/janedoe | https://janedoe.github.io/\n"
+            "https://www.acme-corp.com https://doi.org/10.1000/xyz https://www.kaggle.com/janedoe\n")
+    assert extract_profile(text, today=TODAY)["portfolio_github_links"] == [
+        "https://github.com/janedoe", "https://janedoe.github.io/", "https://www.kaggle.com/janedoe"]
+
+
+def test_no_portfolio_links_from_other_urls():
+    text = "Jane Doe\nCertificate: https://coursera.org/verify/ABC123\n"
+    assert "portfolio_github_links" not in extract_profile(text, today=TODAY)
+
+
+def test_merge_profile_overrides_contacts_and_fills_the_rest():
+    data = {"email": "typo@exmaple.com", "linkedin_link": None, "applicant_name": "Jane A. Doe",
+            "current_or_last_company": "", "phone": "+91 98765 43210"}
+    profile = {"email": "jane@example.com", "linkedin_link": "https://www.linkedin.com/in/jane",
+               "applicant_name": "Jane Doe", "current_or_last_company": "Acme", "phone": "9876543210"}
+    assert merge_profile(data, profile) == {
+        "email": "jane@example.com", "linkedin_link": "https://www.linkedin.com/in/jane",
+        "applicant_name": "Jane A. Doe", "current_or_last_company": "Acme", "phone": "+91 98765 43210"}
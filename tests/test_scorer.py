@@ -0,0 +1,33 @@
+from src import scorer
+from src.scorer import ScoringSession
+
+RUBRIC = {"dimensions": [{"id": "A", "key": "skills", "title": "Skills", "max_points": 10, "bands": []}]}
+
+
+def _session():
+    return ScoringSession("Python developer", RUBRIC, local_profile=True)
+
+
+def test_scores_variant_is_shared_across_resolved_fields():
+    session = _session()
+    first = session._variant({"email"}, "scores")
+    assert session._variant({"email", "phone", "key_roles"}, "scores") is first
+    assert session._variant(set(), "scores") is first
+    assert set(first[0]["properties"]) == {"A_skills_score", "total_score"}
+
+
+def test_full_variant_depends_on_resolved_fields():
+    session = _session()
+    with_email = session._variant({"email"})
+    assert "email" not in with_email[0]["properties"]
+    assert "email" in session._variant(set())[0]["properties"]
+    assert session._variant({"email"}) is with_email
+
+
+def test_variant_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(scorer, "VARIANT_CACHE_SIZE", 3)
+    session = _session()
+    fields = ["email", "phone", "linkedin_link", "applicant_name", "college"]
+    for i in range(len(fields)):
+        session._variant(set(fields[:i + 1]), "explain")
+    assert len(session._variants) == 3
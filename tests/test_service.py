@@ -0,0 +1,130 @@
+import json
+import time
+import threading
+import http.client
+
+import pytest
+
+from benchmarks.bench_backends import start_stub
+from src import service
+from src.backends import BackendRegistry, set_registry
+
+JD = "Python developer with Django and PostgreSQL"
+RUBRIC = "Skills: 0-10 points for relevant skills"
+
+
+def _payload(n=3, **extra):
+    resumes = [{"filename": f"r{i}.txt", "text": f"Candidate {i}. Python Django developer."} for i in range(n)]
+    return {"jd_text": JD, "rubric_text": RUBRIC, "resumes": resumes, "top_k": 2, **extra}
+
+
+def _use_stub(latency=0.0):
+    """Route all LLM calls to a fresh in-process stub server."""
+    stub = start_stub("stub", latency, 0.0)
+    registry = BackendRegistry.from_config([
+        {"name": "stub", "base_url": f"http://127.0.0.1:{stub.server_port}/v1", "api_key": "stub"}])
+    set_registry(registry)
+    return stub, registry
+
+
+@pytest.fixture(scope="module")
+def llm():
+    stub, registry = _use_stub()
+    yield registry
+    set_registry(None)
+    stub.shutdown()
+
+
+def _serve(tmp_path, **kwargs):
+    server = service.make_server(port=0, jobs_dir=str(tmp_path), **kwargs)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def server(tmp_path, llm):
+    server = _serve(tmp_path)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    data = json.dumps(body).encode() if isinstance(body, dict) else body
+    conn.request(method, path, body=data, headers=headers or {})
+    resp = conn.getresponse()
+    status, payload = resp.status, json.loads(resp.read() or b"null")
+    conn.close()
+    return status, payload
+
+
+def _wait(server, job_id, statuses, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        _, state = _request(server, "GET", f"/jobs/{job_id}")
+        if state["status"] in statuses:
+            return state
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {state['status']}")
+
+
+def test_job_runs_end_to_end(server):
+    status, body = _request(server, "POST", "/jobs", _payload())
+    assert status == 202
+    job_id = body["job_id"]
+
+    assert _wait(server, job_id, ("done", "failed"))["status"] == "done"
+    status, results = _request(server, "GET", f"/jobs/{job_id}/results")
+    assert status == 200
+    assert len(results) == 2
+    assert [r["rank"] for r in results] == [1, 2]
+    assert {r["resume_file_name"] for r in results} <= {"r0.txt", "r1.txt", "r2.txt"}
+
+
+def test_unknown_job_and_health(server):
+    assert _request(server, "GET", "/jobs/nope")[0] == 404
+    status, body = _request(server, "GET", "/health")
+    assert status == 200 and body["status"] == "ok"
+
+
+@pytest.mark.parametrize("payload", [
+    {"rubric_text": RUBRIC, "resumes": [{"filename": "a.txt", "text": "x"}]},
+    _payload(top_k=0),
+    _payload(top_k="many"),
+    _payload(explain_top=-1),
+    _payload(explain_top=True),
+    {**_payload(), "resumes": []},
+    {**_payload(), "resumes": [{"filename": "a.pdf", "content_base64": "not base64!"}]},
+])
+def test_invalid_payload_is_400(server, payload):
+    status, body = _request(server, "POST", "/jobs", payload)
+    assert status == 400
+    assert body["error"]
+
+
+def test_bad_body_is_400(server):
+    assert _request(server, "POST", "/jobs", b"{not json")[0] == 400
+    assert _request(server, "POST", "/jobs", b"{}", headers={"Content-Length": "lots"})[0] == 400
+
+
+def test_oversized_body_is_413(server, monkeypatch):
+    monkeypatch.setattr(service, "SERVICE_MAX_BODY_BYTES", 100)
+    assert _request(server, "POST", "/jobs", _payload(n=20))[0] == 413
+
+
+def test_full_queue_is_429(tmp_path, llm):
+    slow, _ = _use_stub(latency=1.0)
+    server = _serve(tmp_path, workers=1, max_queue=1)
+    try:
+        running = _request(server, "POST", "/jobs", _payload(n=1))[1]["job_id"]
+        _wait(server, running, ("running",))
+        assert _request(server, "POST", "/jobs", _payload(n=1))[0] == 202  # waits for the worker
+        status, body = _request(server, "POST", "/jobs", _payload(n=1))
+        assert status == 429
+        assert body["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        slow.shutdown()
+        set_registry(llm)
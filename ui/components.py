@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List
 
 def show_progress_indicator(current_step: int):
     """Display progress indicator for the workflow"""
@@ -31,8 +31,12 @@ def show_file_upload(accept_multiple: bool = True) -> List:
 
         with st.expander("View uploaded files"):
             files = uploaded_files if accept_multiple else [uploaded_files]
-            for file in files:
-                st.write(f"📄 {file.name} ({file.size} bytes)")
+            # One table element instead of one element per file keeps large uploads snappy
+            st.dataframe(
+                pd.DataFrame({"File": [f.name for f in files], "Bytes": [f.size for f in files]}),
+                width="stretch",
+                hide_index=True
+            )
 
     return uploaded_files
 
@@ -48,50 +52,105 @@ def show_cost_estimation(k_value: int, model: str):
     else:
         st.info("🎯 Higher accuracy option")
 
-def show_summary_stats(results: List[Dict[str, Any]]):
+PAGE_SIZES = [25, 50, 100, 250]
+
+def _reset_results_page():
+    st.session_state.results_page = 1
+
+def show_summary_stats(df: pd.DataFrame):
     """Display summary statistics"""
-    if not results:
+    if df is None or df.empty:
         return
 
-    df = pd.DataFrame(results)
+    scores = df['total_score']
 
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Scored", len(results))
+        st.metric("Total Scored", len(df))
     with col2:
-        avg_score = df['total_score'].mean()
+        avg_score = scores.mean()
         st.metric("Average Score", f"{avg_score:.1f}")
     with col3:
-        top_score = df['total_score'].max()
+        top_score = scores.max()
         st.metric("Top Score", f"{top_score}")
     with col4:
-        score_range = f"{df['total_score'].min()}-{df['total_score'].max()}"
+        score_range = f"{scores.min()}-{scores.max()}"
         st.metric("Score Range", score_range)
 
-def show_results_table(results: List[Dict[str, Any]]):
-    """Display sortable results table"""
-    if not results:
-        return
+def filter_results(df: pd.DataFrame, query: str = "", min_score: float = 0) -> pd.DataFrame:
+    """Vectorized filter on file name / applicant name / email and minimum total score"""
+    mask = df['total_score'] >= min_score
+    query = query.strip()
+    if query:
+        text_mask = pd.Series(False, index=df.index)
+        for col in ('resume_file_name', 'applicant_name', 'email'):
+            if col in df.columns:
+                text_mask |= df[col].astype("string").str.contains(query, case=False, regex=False, na=False)
+        mask &= text_mask
+    return df[mask]
+
+def show_results_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Display a filterable, paginated results table; returns the filtered frame"""
+    if df is None or df.empty:
+        return df
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        query = st.text_input("Search name, file or email", key="results_query", on_change=_reset_results_page)
+    with col2:
+        max_score = int(df['total_score'].max() or 0)
+        min_score = st.slider("Minimum total score", 0, max(max_score, 1), 0, key="results_min_score",
+                              on_change=_reset_results_page)
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="results_page_size",
+                                 on_change=_reset_results_page)
 
-    df = pd.DataFrame(results)
+    filtered = filter_results(df, query, min_score)
+    pages = max(1, -(-len(filtered) // page_size))
+    # Page lives in session state only (reset by the filters above); keep it within range
+    st.session_state.results_page = min(st.session_state.get("results_page", 1), pages)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="results_page")
+    st.caption(f"Showing {len(filtered)} of {len(df)} candidates")
 
     # Select columns to display
     display_columns = [
-        'resume_file_name', 'total_score', 'applicant_name',
-        'email', 'phone', 'prefilter_score'
+        'rank', 'resume_file_name', 'total_score', 'applicant_name',
+        'email', 'phone', 'prefilter_score', 'scoring_status'
     ]
     available_columns = [col for col in display_columns if col in df.columns]
 
-    # Format and display table
-    display_df = df[available_columns].copy()
-    display_df = display_df.round(2)
+    # Only the visible page is copied and rendered
+    start = (page - 1) * page_size
+    display_df = filtered.iloc[start:start + page_size][available_columns].round(2)
 
     st.dataframe(
         display_df,
         width="stretch",
         hide_index=True
     )
+    return filtered
+
+def show_candidate_details(resume_data, columns):
+    """Basic information and per-dimension scores for one result row"""
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**Basic Information:**")
+        st.write(f"**Name:** {resume_data.get('applicant_name', 'N/A')}")
+        st.write(f"**Email:** {resume_data.get('email', 'N/A')}")
+        st.write(f"**Phone:** {resume_data.get('phone', 'N/A')}")
+        st.write(f"**Total Score:** {resume_data.get('total_score', 'N/A')}")
+
+    with col2:
+        st.write("**Dimension Scores:**")
+        score_columns = [
+            col for col in columns
+            if col.endswith('_score') and col not in ['total_score', 'prefilter_score']
+        ]
+        for col in score_columns:
+            dimension_name = col.replace('_score', '').replace('_', ' ').title()
+            st.write(f"**{dimension_name}:** {resume_data.get(col, 'N/A')}")
 
 def show_navigation_buttons(current_step: int, can_proceed: bool = True):
     """Show navigation buttons for steps"""
@@ -1,113 +1,156 @@
 import streamlit as st
-import tempfile
-import os
-import time
+import pandas as pd
 import logging
-from src.parser import parse_resumes
-from src.prefilter import prefilter_resumes
-from src.scorer import score_with_llm
-from src.ranker import aggregate_and_rank
+from src.jobs import JobRunner, JobStore, screening_job, ACTIVE_STATUSES
+from src.ranker import insert_ranked
+from ui.components import show_summary_stats, show_candidate_details
 from ui.utils import calculate_k_value
 
 # Set up logging to show in Streamlit
 logging.basicConfig(level=logging.INFO)
 
+POLL_SECONDS = 2
+LIVE_TOP = 20  # rows shown in the live leaderboard while a job runs
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """One background job runner shared by every session of this app process"""
+    return JobRunner(JobStore())
+
+@st.cache_resource(max_entries=16)
+def load_results_frame(job_id: str) -> pd.DataFrame:
+    """Build the results frame once per job; shared read-only across reruns and sessions"""
+    return pd.DataFrame(get_job_runner().results(job_id) or [])
+
+@st.cache_resource(max_entries=16)
+def results_csv(job_id: str) -> bytes:
+    """CSV export, generated on first request only"""
+    return load_results_frame(job_id).to_csv(index=False).encode("utf-8")
+
+def start_processing():
+    """Submit the uploaded inputs as a background screening job and track it by id"""
+    uploaded = st.session_state.uploaded_resumes
+    k_value = calculate_k_value(len(uploaded), st.session_state.prefilter_percent)
+
+    job_id = get_job_runner().submit(
+        screening_job(
+            [(f.name, f.getvalue()) for f in uploaded],
+            st.session_state.jd_text,
+            st.session_state.rubric_text,
+            k_value,
+            model=st.session_state.model_choice,
+        ),
+        params={
+            "resumes": len(uploaded),
+            "top_k": k_value,
+            "model": st.session_state.model_choice,
+        },
+    )
+
+    st.session_state.job_id = job_id
+    st.query_params["job"] = job_id
+    st.rerun()
+
+def _live_ranked(job_id: str) -> list:
+    """Results finished so far, ranked; only rows appended since the last poll are read and inserted"""
+    if st.session_state.get("live_job_id") != job_id:
+        st.session_state.live_job_id = job_id
+        st.session_state.live_offset = 0
+        st.session_state.live_ranked = []
+        st.session_state.live_csv = None
+        st.session_state.live_selected_name = None
+    rows, st.session_state.live_offset = get_job_runner().partial(job_id, st.session_state.live_offset)
+    for r in rows:
+        insert_ranked(st.session_state.live_ranked, r)
+    return st.session_state.live_ranked
+
+def show_live_results(job_id: str):
+    """Live leaderboard, running stats and partial download while scoring is in flight"""
+    ranked = _live_ranked(job_id)
+    if not ranked:
+        return
+
+    st.subheader(f"🏁 Live Leaderboard ({len(ranked)} scored so far)")
+    show_summary_stats(pd.DataFrame({"total_score": [r.get("total_score", 0) for r in ranked]}))
+
+    top = pd.DataFrame(ranked[:LIVE_TOP])
+    columns = [c for c in ['rank', 'resume_file_name', 'total_score', 'applicant_name', 'email', 'scoring_status']
+               if c in top.columns]
+    st.dataframe(top[columns], width="stretch", hide_index=True)
+
+    # Keyed by file name, not position: the ranking re-sorts on every poll. The widget is
+    # rebuilt whenever new rows arrive, so the choice is carried over in live_selected_name.
+    by_name = {r.get("resume_file_name"): r for r in ranked}
+    names = list(by_name)
+    current = st.session_state.get("live_selected_name")
+    selected = st.selectbox(
+        "Open a finished candidate",
+        options=names,
+        format_func=lambda name: f"#{by_name[name].get('rank')} {name}",
+        index=names.index(current) if current in by_name else None,
+        key="live_selected",
+    )
+    st.session_state.live_selected_name = selected
+    if selected in by_name:
+        show_candidate_details(by_name[selected], list(by_name[selected].keys()))
+
+    # Snapshot CSV of everything finished so far, built only on request
+    if st.button(f"📄 Prepare CSV of {len(ranked)} finished results", key="live_csv_prepare"):
+        st.session_state.live_csv = pd.DataFrame(ranked).to_csv(index=False).encode("utf-8")
+    if st.session_state.get("live_csv"):
+        st.download_button(
+            label="📥 Download Finished Results CSV",
+            data=st.session_state.live_csv,
+            file_name="resume_screening_partial_results.csv",
+            mime="text/csv",
+            key="live_csv_download",
+        )
+
+@st.fragment(run_every=POLL_SECONDS)
+def show_job_progress(job_id: str):
+    """Poll the background job and show its progress; jump to results when done"""
+    runner = get_job_runner()
+    state = runner.get(job_id)
+
+    if state is None:
+        st.error("❌ Job not found. It may have been removed.")
+        return
+
+    status = state.get("status")
+    st.progress(state.get("progress", 0.0))
+    st.text(state.get("message", ""))
+
+    if status in ACTIVE_STATUSES:
+        show_live_results(job_id)
+
+    log_lines = state.get("log") or []
+    if log_lines:
+        st.code("\n".join(log_lines[-15:]), language=None)
+
+    if status == "done":
+        st.session_state.results = load_results_frame(job_id)
+        st.session_state.step = 4
+        st.rerun()
+
+    if status not in ACTIVE_STATUSES:
+        error = state.get("error") or {}
+        st.error(f"❌ Error during processing: {error.get('details', state.get('message'))}")
+        if error:
+            st.write("🔍 **Debug Information:**")
+            st.write(f"Error type: {error.get('type')}")
+            st.write(f"Error details: {error.get('details')}")
+            if "PDF" in str(error.get("details")) or "startxref" in str(error.get("details")):
+                st.write("💡 **Suggestion**: This looks like a PDF parsing error. Some PDFs may be corrupted or have unusual formatting.")
+
 def process_resumes():
-    """Process the resumes and show progress"""
+    """Show progress for the current background screening job"""
     st.header("⏳ Processing...")
 
-    # Add warning about browser refresh
-    st.warning("⚠️ **Important**: Do not refresh the browser or close this tab during processing - you'll lose all progress and have to start over!")
-
-    # Create temporary directory for uploaded files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        try:
-            # Step 1: Save uploaded files
-            status_text.text("📁 Saving uploaded files...")
-            st.write(f"💾 Saving {len(st.session_state.uploaded_resumes)} files...")
-            for i, uploaded_file in enumerate(st.session_state.uploaded_resumes):
-                file_path = os.path.join(temp_dir, uploaded_file.name)
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getvalue())
-                progress_bar.progress((i + 1) / len(st.session_state.uploaded_resumes) * 0.2)
-                st.write(f"✅ Saved: {uploaded_file.name}")
-
-            # Step 2: Parse resumes
-            status_text.text("📄 Parsing resumes...")
-            st.write("🔍 Starting resume parsing...")
-            resumes = parse_resumes(temp_dir)
-            st.write(f"✅ Successfully parsed {len(resumes)} resumes")
-
-            # Show parsing results
-            successful_parses = [r for r in resumes if not r['text'].startswith('ERROR')]
-            failed_parses = [r for r in resumes if r['text'].startswith('ERROR')]
-
-            if failed_parses:
-                st.warning(f"⚠️ {len(failed_parses)} PDFs had parsing issues but will still be processed:")
-                for failed in failed_parses:
-                    st.write(f"   - {failed['filename']}")
-
-            progress_bar.progress(0.3)
-
-            # Step 3: Prefilter
-            status_text.text("🔍 Prefiltering with TF-IDF...")
-            k_value = calculate_k_value(
-                len(resumes),
-                st.session_state.prefilter_percent
-            )
-            st.write(f"🎯 Prefiltering to top {k_value} resumes...")
-            shortlisted = prefilter_resumes(resumes, st.session_state.jd_text, top_k=k_value)
-            st.write(f"✅ Shortlisted {len(shortlisted)} resumes for LLM scoring")
-            progress_bar.progress(0.4)
-
-            # Step 4: Parse rubric (save rubric temporarily and set path)
-            status_text.text("📊 Parsing rubric...")
-            st.write("📊 Parsing scoring rubric with LLM...")
-            rubric_path = os.path.join(temp_dir, "rubric.txt")
-            with open(rubric_path, "w") as f:
-                f.write(st.session_state.rubric_text)
-            os.environ["RUBRIC_PATH"] = rubric_path
-            st.write("✅ Rubric parsed successfully")
-            progress_bar.progress(0.5)
-
-            # Step 5: Score with LLM
-            status_text.text("🤖 Scoring with LLM...")
-            st.write("🤖 Starting LLM scoring (this may take a few minutes)...")
-            results = []
-            for i, resume in enumerate(shortlisted):
-                st.write(f"   🔄 Scoring: {resume['filename']} ({i + 1}/{len(shortlisted)})")
-                scored = score_with_llm(resume, st.session_state.jd_text)
-                results.append(scored)
-                progress = 0.5 + (i + 1) / len(shortlisted) * 0.4
-                progress_bar.progress(progress)
-                status_text.text(f"🤖 Scoring with LLM... ({i + 1}/{len(shortlisted)})")
-                st.write(f"   ✅ Completed: {resume['filename']}")
-
-            # Step 6: Rank results
-            status_text.text("📈 Ranking results...")
-            st.write("📈 Ranking and aggregating results...")
-            ranked_results = aggregate_and_rank(results)
-            st.write(f"✅ Final ranking complete! {len(ranked_results)} resumes scored.")
-            progress_bar.progress(1.0)
-
-            # Store results
-            st.session_state.results = ranked_results
-            status_text.text("✅ Processing complete!")
-
-            # Move to results step
-            time.sleep(2)
-            st.session_state.step = 4
-            st.rerun()
-
-        except Exception as e:
-            st.error(f"❌ Error during processing: {str(e)}")
-            st.write("🔍 **Debug Information:**")
-            st.write(f"Error type: {type(e).__name__}")
-            st.write(f"Error details: {str(e)}")
-            if "PDF" in str(e) or "startxref" in str(e):
-                st.write("💡 **Suggestion**: This looks like a PDF parsing error. Some PDFs may be corrupted or have unusual formatting.")
-            status_text.text("❌ Processing failed")
-            st.stop()
\ No newline at end of file
+    job_id = st.session_state.job_id
+    st.info(
+        "ℹ️ Screening runs in the background. You can safely refresh or reconnect - "
+        "this page URL keeps track of your job."
+    )
+    st.caption(f"Job ID: `{job_id}`")
+
+    show_job_progress(job_id)
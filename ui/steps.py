@@ -1,14 +1,13 @@
 import streamlit as st
-import pandas as pd
 from ui.components import (
     show_file_upload, show_cost_estimation, show_navigation_buttons,
-    show_summary_stats, show_results_table
+    show_summary_stats, show_results_table, show_candidate_details
 )
 from ui.utils import (
     validate_api_key, set_environment_variables, calculate_k_value,
-    load_sample_rubric, reset_to_step_one
+    load_sample_rubric, reset_to_step_one, clear_job
 )
-from ui.processor import process_resumes
+from ui.processor import process_resumes, start_processing, results_csv
 
 def step1_setup():
     """Step 1: API Key and Model Selection"""
@@ -150,6 +149,14 @@ def step2_uploads():
 
 def step3_process():
     """Step 3: Review and Process"""
+    if st.session_state.job_id:
+        process_resumes()
+        if st.button("← Back"):
+            clear_job()
+            st.session_state.step = 2
+            st.rerun()
+        return
+
     st.header("🔍 Review & Process")
 
     # Summary
@@ -189,8 +196,8 @@ def step3_process():
 
     with col2:
         if st.button("🚀 Start Screening", type="primary"):
-            # Process resumes and move to results
-            process_resumes()
+            # Hand off to a background job; progress is polled by job id
+            start_processing()
 
 def step4_results():
     """Step 4: Display Results"""
@@ -200,47 +207,32 @@ def step4_results():
         st.error("No results available")
         return
 
-    results = st.session_state.results
+    df = st.session_state.results
 
     # Summary statistics
     st.subheader("📈 Summary Statistics")
-    show_summary_stats(results)
+    show_summary_stats(df)
 
     # Results table
     st.subheader("🏆 Ranking Table")
-    show_results_table(results)
+    filtered = show_results_table(df)
 
     # Individual resume details
     st.subheader("📋 Individual Resume Details")
-    df = pd.DataFrame(results)
-
-    selected_resume = st.selectbox(
-        "Select a resume to view details",
-        options=df['resume_file_name'].tolist(),
-        key="selected_resume"
-    )
-
-    if selected_resume:
-        resume_data = df[df['resume_file_name'] == selected_resume].iloc[0]
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.write("**Basic Information:**")
-            st.write(f"**Name:** {resume_data.get('applicant_name', 'N/A')}")
-            st.write(f"**Email:** {resume_data.get('email', 'N/A')}")
-            st.write(f"**Phone:** {resume_data.get('phone', 'N/A')}")
-            st.write(f"**Total Score:** {resume_data.get('total_score', 'N/A')}")
+    if filtered is None or filtered.empty:
+        st.info("No candidates match the current filters")
+        selected_row = None
+    else:
+        file_names = df['resume_file_name']
+        selected_row = st.selectbox(
+            "Select a resume to view details",
+            options=filtered.index.tolist(),
+            format_func=lambda i: file_names.at[i],
+            key="selected_resume"
+        )
 
-        with col2:
-            st.write("**Dimension Scores:**")
-            score_columns = [
-                col for col in df.columns
-                if col.endswith('_score') and col not in ['total_score', 'prefilter_score']
-            ]
-            for col in score_columns:
-                dimension_name = col.replace('_score', '').replace('_', ' ').title()
-                st.write(f"**{dimension_name}:** {resume_data.get(col, 'N/A')}")
+    if selected_row is not None:
+        show_candidate_details(df.loc[selected_row], df.columns)
 
     # Navigation and downloads
     col1, col2 = st.columns(2)
@@ -251,11 +243,14 @@ def step4_results():
             st.rerun()
 
     with col2:
-        # Download CSV
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Results CSV",
-            data=csv,
-            file_name="resume_screening_results.csv",
-            mime="text/csv"
-        )
\ No newline at end of file
+        # CSV is only serialized once someone asks for it, then cached per job
+        if st.session_state.get("csv_requested"):
+            st.download_button(
+                label="📥 Download Results CSV",
+                data=results_csv(st.session_state.job_id),
+                file_name="resume_screening_results.csv",
+                mime="text/csv"
+            )
+        elif st.button("📄 Prepare Results CSV"):
+            st.session_state.csv_requested = True
+            st.rerun()
@@ -2,6 +2,8 @@ import streamlit as st
 import os
 from typing import Dict, Any
 
+from src.backends import set_registry
+
 def init_session_state():
     """Initialize all session state variables"""
     # Check for existing API key in environment
@@ -15,19 +17,28 @@ def init_session_state():
         'jd_text': "",
         'rubric_text': "",
         'prefilter_percent': 25,
-        'results': None
+        'results': None,
+        'job_id': None
     }
 
     for key, default_value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = default_value
 
+    # Re-attach to a background job after a browser refresh or reconnect
+    job_id = st.query_params.get("job")
+    if job_id and st.session_state.job_id is None:
+        st.session_state.job_id = job_id
+        st.session_state.step = 3
+
 def validate_api_key(api_key: str) -> bool:
     """Validate OpenAI API key format"""
     return api_key.startswith("sk-") and len(api_key) > 40
 
 def set_environment_variables(api_key: str, model: str):
     """Set required environment variables"""
+    if os.environ.get("OPENAI_API_KEY") != api_key:
+        set_registry(None)  # rebuild LLM clients with the new key on next use
     os.environ["OPENAI_API_KEY"] = api_key
     os.environ["OPENAI_MODEL_PARSE"] = model
     os.environ["OPENAI_MODEL_SCORE"] = model
@@ -44,10 +55,21 @@ def load_sample_rubric() -> str:
     except FileNotFoundError:
         return ""
 
+def clear_job():
+    """Forget the current background job (the job itself keeps its stored results)"""
+    st.session_state.job_id = None
+    st.session_state.live_job_id = None
+    st.session_state.live_csv = None
+    st.session_state.live_selected_name = None
+    if "job" in st.query_params:
+        del st.query_params["job"]
+
 def reset_to_step_one():
     """Reset session state and go back to step 1"""
+    clear_job()
     st.session_state.step = 1
     st.session_state.results = None
+    st.session_state.csv_requested = False
     st.session_state.uploaded_resumes = []
     st.session_state.jd_text = ""
     st.session_state.rubric_text = ""
\ No newline at end of file